@@ -0,0 +1,434 @@
+# === Benchmarks ===
+"""
+Benchmarks of the generator and workspace harness. Each benchmark is a subcommand, e.g.
+    python bench.py downloads --files 8 --size 20
+"""
+from pathlib import Path
+import tempfile
+import threading
+import asyncio
+import time
+import os
+
+from argparse import ArgumentParser
+
+
+def timed(f, *args):
+    """
+    Returns the result of f(*args) and the time in seconds it took.
+    """
+    start = time.perf_counter()
+    result = f(*args)
+
+    return result, time.perf_counter() - start
+
+
+# === Downloads ===
+def bench_downloads(args):
+    """
+    Compares downloading large zip files one by one with requests against the asynchronous Downloader, both from a local mock server.
+    """
+    import requests
+
+    from downloader import Downloader
+    from mock_server import server
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Random bytes, so nothing along the way can compress them
+        for x in range(args.files):
+            with open(Path(tmp) / f"{x:02}.zip", "wb") as fw:
+                fw.write(os.urandom(args.size * 1024 * 1024))
+
+        s = server(tmp, 0)
+        threading.Thread(target=s.serve_forever, daemon=True).start()
+
+        urls = [f"http://localhost:{s.server_address[1]}/{x:02}.zip" for x in range(args.files)]
+
+        def sequential():
+            headers = {'User-Agent': 'Mozilla'}
+
+            for url in urls:
+                requests.get(url, stream=True, headers=headers).content
+
+        def concurrent():
+            # The random bytes are not zip files
+            d = Downloader(per_host=args.per_host, verify_zip=False)
+
+            try:
+                asyncio.run(d.fetch_all(urls, lambda url, content, error: None))
+
+            finally:
+                d.close()
+
+        total = args.files * args.size
+
+        for name, f in [("sequential requests.get", sequential), ("Downloader", concurrent)]:
+            _, t = timed(f)
+
+            print(f"{name}: {t:.2f} s ({total / t:.1f} MB/s)")
+
+        s.shutdown()
+
+
+def bench_resume(args):
+    """
+    Downloads a large zip file from a local mock server that drops the connection partway through a number of responses, checking that the download resumes to the same bytes.
+    """
+    import hashlib
+    from zipfile import ZipFile, ZIP_STORED
+
+    from downloader import Downloader
+    from mock_server import server
+
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = Path(tmp) / "cases.zip"
+
+        # Random bytes, stored as they are, so the zip file has the given size
+        with ZipFile(zip_path, "w", ZIP_STORED) as zf:
+            zf.writestr("input/input00.txt", os.urandom(args.size * 1024 * 1024))
+
+        expected = hashlib.sha256(zip_path.read_bytes()).hexdigest()
+        drop_after = zip_path.stat().st_size // (args.drops + 1)
+
+        s = server(tmp, 0, drop_after, args.drops)
+        threading.Thread(target=s.serve_forever, daemon=True).start()
+
+        url = f"http://localhost:{s.server_address[1]}/cases.zip"
+
+        d = Downloader(parts=Path(tmp) / "parts", backoff=0)
+
+        try:
+            f, t = timed(d.download, url)
+
+            with f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+
+        finally:
+            d.close()
+            s.shutdown()
+
+        print(f"{args.size} MB zip file with {args.drops} dropped connections: {t:.2f} s ({args.size / t:.1f} MB/s), {'intact' if digest == expected else 'CORRUPT'}")
+
+
+# === Extraction ===
+def extraction_rss(f, zip_path, dest, queue):
+    """
+    Writes the cases of the zip file at zip_path into dest with the extraction function f, then puts the peak RSS of the process in MB into queue. To be run in its own process.
+    """
+    import resource
+
+    from writers import TestCaseWriter
+
+    inputs, outputs = f(zip_path)
+    TestCaseWriter(Path(dest), inputs, outputs).write()
+
+    # ru_maxrss is in kilobytes on Linux
+    queue.put(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+
+def extract_in_memory(zip_path):
+    """
+    The in-memory path: the whole zip file is read into memory and every case decoded into a string.
+    """
+    from challenge import extract_cases
+
+    with open(zip_path, "rb") as fr:
+        return extract_cases(fr.read())
+
+
+def extract_streaming(zip_path):
+    """
+    The streaming path: the zip file stays on disk and every case is streamed into its case file.
+    """
+    from challenge import stream_cases
+
+    return stream_cases(open(zip_path, "rb"))
+
+
+def bench_extraction(args):
+    """
+    Compares the peak RSS and time of writing the cases of a large zip file in memory against streaming them.
+    """
+    import multiprocessing
+    from zipfile import ZipFile, ZIP_DEFLATED
+
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = Path(tmp) / "cases.zip"
+
+        # Numbers compress much like real test cases do
+        line = " ".join(["1234567"] * 16) + "\n"
+        lines = args.size * 1024 * 1024 // len(line)
+
+        with ZipFile(zip_path, "w", ZIP_DEFLATED) as zf:
+            for x in range(args.cases):
+                zf.writestr(f"input/input{x:02}.txt", line * lines)
+                zf.writestr(f"output/output{x:02}.txt", line * lines)
+
+        print(f"{args.cases} cases of {args.size} MB inputs and outputs, zip file of {zip_path.stat().st_size / 1024 / 1024:.1f} MB")
+
+        for name, f in [("in memory", extract_in_memory), ("streaming", extract_streaming)]:
+            dest = Path(tempfile.mkdtemp(dir=tmp))
+            queue = multiprocessing.Queue()
+
+            p = multiprocessing.Process(target=extraction_rss, args=(f, zip_path, dest, queue))
+
+            _, t = timed(lambda: (p.start(), p.join()))
+
+            print(f"{name}: {t:.2f} s, peak RSS {queue.get():.1f} MB")
+
+
+# === Inputs ===
+def bench_inputs(args):
+    """
+    Compares the harness overhead per line of reading inputs through the former list.pop(0) mock, the input() mock and a replaced sys.stdin.
+    """
+    import io
+
+    import functions_base as fb
+
+    for n in args.lines:
+        string = "\n".join(["1 2 3"] * n)
+
+        def pop():
+            lines = string.split("\n")
+
+            for _ in range(n):
+                lines.pop(0)
+
+        def mock_input():
+            fb.set_inputs(string)
+
+            for _ in range(n):
+                fb.input()
+
+        def stdin_readline():
+            stdin = io.TextIOWrapper(io.BytesIO(string.encode("utf-8")), encoding="utf-8")
+
+            for _ in range(n):
+                stdin.readline()
+
+        def stdin_buffer():
+            stdin = io.TextIOWrapper(io.BytesIO(string.encode("utf-8")), encoding="utf-8")
+            stdin.buffer.read().split(b"\n")
+
+        print(f"{n} lines:")
+
+        for name, f in [("list.pop(0)", pop), ("input()", mock_input), ("sys.stdin.readline()", stdin_readline), ("sys.stdin.buffer.read()", stdin_buffer)]:
+            _, t = timed(f)
+
+            print(f"  {name}: {t * 1e9 / n:.0f} ns per line")
+
+
+# === Case files ===
+def bench_cases(args):
+    """
+    Compares the disk footprint, index time and load time of plain text case files against gzip and lzma compressed ones, for cases of each size.
+    """
+    import random
+    import tracemalloc
+
+    import test_functions as tf
+    from writers import TestCaseWriter
+
+    rng = random.Random(0)
+
+    for size in args.sizes:
+        # Random numbers compress much like real test cases do
+        line = lambda: " ".join(str(rng.randint(1, 10 ** 9)) for _ in range(10))
+        lines = max(1, size * 1024 // len(line()))
+
+        inputs, outputs = ["\n".join(line() for _ in range(lines)) for _ in range(2)]
+
+        print(f"Inputs and outputs of {len(inputs) / 1024:.0f} KB each:")
+
+        for compression in [None, "gzip", "lzma"]:
+            with tempfile.TemporaryDirectory() as tmp:
+                _, write = timed(TestCaseWriter(Path(tmp), [inputs], [outputs], compression).write)
+
+                path = next(Path(tmp).iterdir())
+
+                entry, index = timed(tf.scan_case, path)
+                case = tf.Case(path, entry)
+
+                tracemalloc.start()
+                _, load = timed(case.load)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                assert case["inputs"] == inputs and case["outputs"] == outputs
+
+                print(f"  {compression or 'plain'}: {path.stat().st_size / 1024:.0f} KB on disk, written in {write * 1000:.1f} ms, indexed in {index * 1000:.1f} ms, loaded in {load * 1000:.1f} ms with {peak / 1024 / 1024:.1f} MB peak")
+
+
+# === Template ===
+def generate_page(lines, paragraphs=0):
+    """
+    Returns a generated challenge page with the given lines of online code, and paragraphs of problem statement to pad it to a realistic size.
+    """
+    # Code rendered by the editor uses non-breaking spaces
+    rendered = "".join(f'<div class="view-line"><span>{l.replace(" ", chr(0xa0))}</span></div>' for l in lines)
+    statement = "".join(f"<p>Paragraph {x} of the <strong>problem</strong> statement, with <code>inline code</code>.</p>" for x in range(paragraphs))
+    languages = "".join(f'<div id="lang-{x}">{l}</div>' for x, l in enumerate(["C", "C++", "Java 8", "Python 3", "Ruby"]))
+
+    return f"""<html><body>
+        <div class="text-headline">Generated Challenge</div>
+        <div class="challenge-sidebar-help"><div><p>Difficulty</p><p class="pull-right">Medium</p></div></div>
+        <div class="problem-statement">{statement}</div>
+        <a id="test-cases-link" href="/rest/contests/master/challenges/generated/download_testcases">Download</a>
+        <div class="css-1hwfws3">Python 3</div>
+        <div class="css-m62ux7">{languages}</div>
+        <div class="view-lines">{rendered}</div>
+    </body></html>"""
+
+
+def parse_concat(s, printables, wild=" "):
+    """
+    The former Parser.parse, building the parsed string one character at a time.
+    """
+    new_string = ""
+
+    for i in s:
+        new_string += i if i in printables else wild
+
+    return new_string
+
+
+def bench_template(args):
+    """
+    Compares extracting the online code by scraping the editor's lines from the page and parsing them character by character, against parsing the editor's model text with the translation table.
+    """
+    import string
+
+    from soup import soup
+    from char_parser import Parser
+    from challenge import editor_lines
+
+    if args.page:
+        page = Path(args.page).read_text(encoding="utf-8")
+        lines = editor_lines(soup(page))
+
+    else:
+        lines = [f"    result{x} = solve(arr[{x}], k)  # line {x}" for x in range(args.lines)]
+        page = generate_page(lines)
+
+    # The editor's model holds the same code as text
+    code = "\n".join(lines)
+    printables = set(string.printable)
+
+    def scrape_dom():
+        return [parse_concat(l, printables) for l in editor_lines(soup(page))]
+
+    def read_model():
+        p = Parser()
+
+        return [p.parse(l) for l in code.split("\n")]
+
+    (old, t_old), (new, t_new) = timed(scrape_dom), timed(read_model)
+
+    assert old == new, "The extractions differ."
+
+    print(f"{len(lines)} lines, {len(code) / 1024:.0f} KB:")
+    print(f"  Scraped page, character by character: {t_old * 1000:.1f} ms")
+    print(f"  Editor model, translation table: {t_new * 1000:.2f} ms ({t_old / t_new:.0f}x)")
+
+    # The parsers alone, on the whole code
+    p = Parser()
+
+    _, t_old = timed(parse_concat, code, printables)
+    _, t_new = timed(p.parse, code)
+
+    print(f"  Parsing alone: {t_old * 1000:.1f} ms character by character, {t_new * 1000:.2f} ms with the translation table")
+
+
+# === Parse ===
+def bench_parse(args):
+    """
+    Compares the time and peak memory of parsing a challenge page once per extraction, as the scraper formerly did, against parsing it once into a Page, whole or strained to the elements read, with each installed parser backend.
+    """
+    import tracemalloc
+
+    from soup import soup, PARSERS
+    from page import Page
+    from bs4.builder import builder_registry
+
+    if args.page:
+        source = Path(args.page).read_text(encoding="utf-8")
+
+    else:
+        source = generate_page([f"def solve{x}(arr):" for x in range(args.lines)], args.paragraphs)
+
+    def extract(page):
+        return page.language, page.title, page.difficulty, page.samples_link, page.editor
+
+    def per_extraction(parser):
+        # The language check, the language list, the title and difficulty, the samples link, and the editor
+        Page(source, parser, strain=False).language
+        Page(source, parser, strain=False).languages
+        page = Page(source, parser, strain=False)
+        page.title, page.difficulty
+        Page(source, parser, strain=False).samples_link
+
+        return Page(source, parser, strain=False).editor
+
+    def once(parser):
+        return extract(Page(source, parser, strain=False))
+
+    def strained(parser):
+        return extract(Page(source, parser))
+
+    print(f"Page of {len(source) / 1024:.0f} KB:")
+
+    for parser in [p for p in PARSERS if builder_registry.lookup(p)]:
+        for name, f in [("parsed per extraction", per_extraction), ("parsed once", once), ("parsed once, strained", strained)]:
+            _, t = timed(f, parser)
+
+            tracemalloc.start()
+            f(parser)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(f"  {parser}, {name}: {t * 1000:.1f} ms, {peak / 1024 / 1024:.1f} MB peak")
+
+
+# === Script ===
+if __name__ == "__main__":
+    ap = ArgumentParser(description="Runs a benchmark.")
+    sp = ap.add_subparsers(dest="benchmark", required=True)
+
+    bp = sp.add_parser("downloads", help="Concurrent zip downloads from a local mock server.")
+    bp.add_argument("--files", type=int, default=8, help="Number of zip files.")
+    bp.add_argument("--size", type=int, default=20, help="Size of each zip file in MB.")
+    bp.add_argument("--per-host", type=int, default=4, help="Concurrent downloads per host.")
+    bp.set_defaults(func=bench_downloads)
+
+    bp = sp.add_parser("resume", help="Resuming a large zip download from a local mock server that drops connections.")
+    bp.add_argument("--size", type=int, default=50, help="Size of the zip file in MB.")
+    bp.add_argument("--drops", type=int, default=4, help="Number of dropped connections.")
+    bp.set_defaults(func=bench_resume)
+
+    bp = sp.add_parser("extraction", help="Peak RSS of writing the cases of a large zip file.")
+    bp.add_argument("--cases", type=int, default=2, help="Number of cases.")
+    bp.add_argument("--size", type=int, default=50, help="Size of each input and output in MB.")
+    bp.set_defaults(func=bench_extraction)
+
+    bp = sp.add_parser("inputs", help="Harness overhead per line of input.")
+    bp.add_argument("--lines", type=int, nargs="+", default=[1000, 10000, 100000], help="Numbers of lines.")
+    bp.set_defaults(func=bench_inputs)
+
+    bp = sp.add_parser("cases", help="Disk footprint and load time of plain and compressed case files.")
+    bp.add_argument("--sizes", type=int, nargs="+", default=[1, 4096, 16384], help="Sizes of the inputs and outputs in KB.")
+    bp.set_defaults(func=bench_cases)
+
+    bp = sp.add_parser("template", help="Extracting and parsing the online code.")
+    bp.add_argument("--page", help="Recorded page source to scrape, e.g. the page of a cached challenge. By default, a page is generated.")
+    bp.add_argument("--lines", type=int, default=2000, help="Number of lines of the generated page.")
+    bp.set_defaults(func=bench_template)
+
+    bp = sp.add_parser("parse", help="Parsing a challenge page per extraction or once.")
+    bp.add_argument("--page", help="Recorded page source to parse, e.g. the page of a cached challenge. By default, a page is generated.")
+    bp.add_argument("--lines", type=int, default=200, help="Number of lines of online code of the generated page.")
+    bp.add_argument("--paragraphs", type=int, default=2000, help="Number of paragraphs of problem statement of the generated page.")
+    bp.set_defaults(func=bench_parse)
+
+    args = ap.parse_args()
+    args.func(args)
@@ -0,0 +1,180 @@
+# === Complexity benchmark ===
+"""
+Estimates the time complexity of functions.main, to tell whether it will pass HackerRank's large hidden cases.
+
+The inputs come from a user-supplied generator module, by default generator.py in the workspace, defining
+    def generate(n, rng):
+        # Returns the input string of a case of size n, drawing any randomness from rng, a random.Random
+        ...
+
+Run it from the workspace with
+    python benchmark.py --start 100 --ratio 2 --steps 10 --max-n 100000
+"""
+import math
+import random
+import importlib.util
+
+from argparse import ArgumentParser
+
+import test_functions as tf
+
+# Complexity classes to fit the timings against
+CLASSES = {
+    "1": lambda n: 1.0,
+    "log n": lambda n: math.log2(n),
+    "n": lambda n: float(n),
+    "n log n": lambda n: n * math.log2(n),
+    "n^2": lambda n: float(n) ** 2,
+    "n^3": lambda n: float(n) ** 3,
+    "2^n": lambda n: 2.0 ** n if n < 1000 else math.inf,
+}
+
+
+def load_generator(path):
+    """
+    Loads the generate(n, rng) function from the module at path.
+    """
+    spec = importlib.util.spec_from_file_location("generator", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module.generate
+
+
+def measure(generate, sizes, repeats=3, seed=0):
+    """
+    Times functions.main on generated inputs of each size, stopping at the first size that fails or exceeds TIME_LIMIT.
+
+    Params
+    ======
+    generate: function
+        The input generator, called as generate(n, rng).
+    sizes: []
+        Array of increasing input sizes.
+    repeats: int
+        The number of runs per size, of which the fastest is kept.
+    seed: int
+        The seed of the generator's random number generator.
+
+    Returns
+    =======
+    timings: []
+        Array of (n, seconds) tuples.
+    """
+    timings = []
+
+    for n in sizes:
+        inputs = generate(n, random.Random(seed))
+        best = math.inf
+
+        for _ in range(repeats):
+            # tracemalloc would distort the timings
+            result, _ = tf.execute(inputs, measure_memory=False)
+
+            if result["error"] is not None:
+                print(f"n = {n}: stopped by {result['error']!r}")
+
+                return timings
+
+            best = min(best, result["wall"])
+
+        print(f"n = {n}: {best * 1000:.2f} ms")
+
+        timings.append((n, best))
+
+        if best > tf.TIME_LIMIT:
+            break
+
+    return timings
+
+
+def fit(timings):
+    """
+    Fits the timings to each complexity class as t = c * f(n), minimising the relative error of each timing.
+
+    Returns
+    =======
+    fits: []
+        Array of (residual, class name, c) tuples, best fit first.
+    """
+    fits = []
+
+    for name, f in CLASSES.items():
+        x = [f(n) / t for n, t in timings]
+
+        if not all(math.isfinite(v) for v in x):
+            continue
+
+        # Least squares of 1 - c * f(n) / t
+        c = sum(x) / sum(v * v for v in x)
+        residual = sum((1 - c * v) ** 2 for v in x) / len(x)
+
+        fits.append((residual, name, c))
+
+    return sorted(fits)
+
+
+def predict_limit(name, c, limit):
+    """
+    Returns the smallest n at which c * f(n) exceeds the limit in seconds for the complexity class of the given name, or None if it never does.
+    """
+    f = CLASSES[name]
+
+    if c * f(2 ** 62) <= limit:
+        return None
+
+    lo, hi = 1, 2
+
+    while c * f(hi) <= limit:
+        lo, hi = hi, hi * 2
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+
+        if c * f(mid) <= limit:
+            lo = mid
+
+        else:
+            hi = mid
+
+    return hi
+
+
+# === Script ===
+if __name__ == "__main__":
+    ap = ArgumentParser(description="Estimates the time complexity of functions.main.")
+    ap.add_argument("--generator", default="generator.py", help="Module defining generate(n, rng).")
+    ap.add_argument("--start", type=int, default=100, help="Smallest input size.")
+    ap.add_argument("--ratio", type=float, default=2, help="Ratio between consecutive input sizes.")
+    ap.add_argument("--steps", type=int, default=10, help="Number of input sizes.")
+    ap.add_argument("--repeats", type=int, default=3, help="Runs per input size, of which the fastest is kept.")
+    ap.add_argument("--seed", type=int, default=0, help="Seed of the generator.")
+    ap.add_argument("--max-n", type=int, help="Largest input size of the challenge, to predict the time of.")
+
+    args = ap.parse_args()
+
+    sizes = sorted(set(int(args.start * args.ratio ** x) for x in range(args.steps)))
+    timings = measure(load_generator(args.generator), sizes, args.repeats, args.seed)
+
+    assert len(timings) >= 3, "At least 3 input sizes are needed to fit the timings."
+
+    fits = fit(timings)
+
+    print("\nFits (mean squared relative error):")
+
+    for residual, name, c in fits:
+        print(f"  O({name}): {residual:.4f}")
+
+    _, name, c = fits[0]
+    limit = predict_limit(name, c, tf.TIME_LIMIT)
+
+    print(f"\nBest fit: O({name})")
+
+    if limit is None:
+        print(f"Predicted never to exceed the time limit of {tf.TIME_LIMIT} s.")
+
+    else:
+        print(f"Predicted to exceed the time limit of {tf.TIME_LIMIT} s from n = {limit}.")
+
+    if args.max_n:
+        print(f"Predicted time at n = {args.max_n}: {c * CLASSES[name](args.max_n):.3f} s.")
@@ -0,0 +1,156 @@
+# === Cache Class ===
+from pathlib import Path
+import json
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
+import os
+
+
+class Cache():
+    """
+    A persistent on-disk cache of fetched challenges, keyed by challenge link and language.
+
+    Each entry holds the page snapshot, the parsed challenge information and the raw sample test case zip file. Entries expire after a time-to-live, and the least recently used entries are evicted once the cache exceeds its size limit.
+    """
+    def __init__(self, path=".cache", ttl_days=30, max_mb=500):
+        """
+        Constructor class. Creates the cache folder if necessary.
+
+        Params
+        ======
+        path: str
+            The cache folder.
+        ttl_days: float
+            The number of days after which an entry expires.
+        max_mb: float
+            The size in megabytes above which least recently used entries are evicted.
+        """
+        self.path = Path(path)
+        self.ttl = ttl_days * 24 * 60 * 60
+        self.max_bytes = max_mb * 1024 * 1024
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # Writes and evictions from parallel downloads must not interleave
+        self.lock = threading.Lock()
+
+
+    def key(self, link, lang):
+        """
+        Returns the key of the given link and language.
+        """
+        return hashlib.sha256(f"{link.strip()}\n{lang}".encode("utf-8")).hexdigest()
+
+
+    def get(self, link, lang):
+        """
+        Returns the cached challenge of the given link and language, or None if it is not cached or has expired.
+
+        Returns
+        =======
+        challenge: dict
+            The challenge information stored by put(), with the page snapshot under "page" and the opened zip file under "samples".
+        """
+        entry = self.path / self.key(link, lang)
+
+        try:
+            with (entry / "meta.json").open("r") as fr:
+                meta = json.load(fr)
+
+            if time.time() - meta["created"] > self.ttl:
+                return None
+
+            challenge = meta["challenge"]
+            challenge["page"] = (entry / "page").read_text(encoding="utf-8")
+            challenge["samples"] = (entry / "samples.zip").open("rb")
+
+            # Mark as recently used
+            os.utime(entry / "meta.json")
+
+        except (OSError, ValueError, KeyError):
+            # Missing or partially evicted entries are misses
+            return None
+
+        return challenge
+
+
+    def put(self, link, lang, challenge):
+        """
+        Stores the challenge of the given link and language, then evicts entries until the cache is within its size limit.
+
+        Params
+        ======
+        challenge: dict
+            The challenge information, with the page snapshot under "page" and the zip file, opened in binary mode, under "samples". The sample inputs and outputs are not stored, as they are extracted from the zip file.
+        """
+        meta = {
+            "link": link,
+            "lang": lang,
+            "created": time.time(),
+            "challenge": {k: v for k, v in challenge.items() if k not in ["page", "samples", "inputs", "outputs"]}
+        }
+
+        # Write the entry fully before moving it into place
+        tmp = Path(tempfile.mkdtemp(dir=self.path, prefix=".tmp"))
+
+        with (tmp / "meta.json").open("w") as fw:
+            json.dump(meta, fw)
+
+        (tmp / "page").write_text(challenge["page"], encoding="utf-8")
+
+        samples = challenge["samples"]
+        samples.seek(0)
+
+        with (tmp / "samples.zip").open("wb") as fw:
+            shutil.copyfileobj(samples, fw)
+
+        samples.seek(0)
+
+        entry = self.path / self.key(link, lang)
+
+        with self.lock:
+            shutil.rmtree(entry, ignore_errors=True)
+            tmp.rename(entry)
+
+            self.evict()
+
+
+    def evict(self):
+        """
+        Removes expired entries, then the least recently used entries until the cache is within its size limit.
+        """
+        entries = []
+
+        for entry in self.path.iterdir():
+            if entry.name.startswith("."):
+                continue
+
+            try:
+                with (entry / "meta.json").open("r") as fr:
+                    created = json.load(fr)["created"]
+
+                used = (entry / "meta.json").stat().st_mtime
+                size = sum(f.stat().st_size for f in entry.iterdir())
+
+            except (OSError, ValueError, KeyError):
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+
+            if time.time() - created > self.ttl:
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+
+            entries.append((used, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+
+        # Least recently used first
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
@@ -0,0 +1,247 @@
+# === Challenge parsing ===
+from pathlib import Path
+import io
+import tempfile
+from zipfile import ZipFile
+
+import re
+
+# The size in bytes of the chunks downloads and zip files are streamed in
+CHUNK_SIZE = 1024 * 1024
+
+# The editor in the challenge page
+EDITOR_CLASS = "view-lines"
+EDITOR_LINE_CLASS = "view-line"
+
+# Returns the online code from the editor's model. Unlike the editor's DOM, which only renders the lines in view, the model holds the whole template
+EDITOR_MODEL_SCRIPT = "return monaco.editor.getModels()[0].getValue()"
+
+
+def split_code(lines, p):
+    """
+    Breaks the lines of the online code into imports, the function definition, and the main block.
+
+    Params
+    ======
+    lines: []
+        Array of the lines of the online code.
+    p: Parser
+        The string parser.
+
+    Returns
+    =======
+    imports: []
+        The import lines
+    function: str
+        The function definition line
+    main: []
+        The lines from if __name__ == '__main__' onwards
+    """
+    imports = []
+    function = None
+    main = []
+
+    for lx, line in enumerate(lines):
+        # Parse
+        s = p.parse(line)
+
+        if re.match("import", s):
+            imports.append(s)
+
+        elif re.match("def", s):
+            function = s
+
+        elif re.match("if __name__", s):
+            main = lines[lx:]
+            main = [p.parse(l) for l in main]
+
+            break
+
+    return imports, function, main
+
+
+def editor_lines(bs):
+    """
+    Scrapes the lines of the online code from the editor in the page. Only the lines the editor renders are in the page, so long templates may be cut short, see EDITOR_MODEL_SCRIPT.
+
+    Params
+    ======
+    bs: BeautifulSoup
+        The page.
+
+    Returns
+    =======
+    lines: []
+        Array of the rendered lines of the online code.
+    """
+    editor_contents = bs.find("div", {"class": EDITOR_CLASS}).findAll("div", {"class": EDITOR_LINE_CLASS})
+
+    return [t.getText() for t in editor_contents]
+
+
+def spool(chunks):
+    """
+    Writes the chunks of bytes into a temporary file, so that large downloads are never held in memory.
+
+    Params
+    ======
+    chunks: iterable
+        The chunks of bytes, e.g. response.iter_content(CHUNK_SIZE).
+
+    Returns
+    =======
+    f: file
+        The temporary file, rewound. It is deleted when closed.
+    """
+    f = tempfile.TemporaryFile()
+
+    for chunk in chunks:
+        f.write(chunk)
+
+    f.seek(0)
+
+    return f
+
+
+def pair_cases(files):
+    """
+    Pairs the input and output files of each case.
+
+    Params
+    ======
+    files: []
+        Array of (name, content) tuples of the non-empty files in the zip file.
+
+    Returns
+    =======
+    sample_inputs: []
+        Array of the sample inputs
+    sample_outputs: []
+        Array of the sample outputs, paired with sample_inputs
+
+    Raises
+    ======
+    AssertionError:
+        If there is a file that is not an input or output, or an input without its output.
+    """
+    # The files come in input00.txt and output00.txt format
+    # Thus, we want to assert that all files come in this format and match them to each other
+    test_cases = {}
+
+    for name, content in files:
+
+        case_re = re.search(r"(output|input)(\d+)\.txt", name)
+
+        assert case_re, "Unsupported test case format."
+
+        case_type = case_re.group(1)
+        case_num = case_re.group(2)
+
+        if case_num not in test_cases.keys():
+            test_cases[case_num] = {}
+
+        test_cases[case_num][case_type] = content
+
+    # Collected samples
+    sample_inputs = []
+    sample_outputs = []
+
+    for tc in test_cases.values():
+
+        assert "input" in tc.keys() and "output" in tc.keys()
+
+        sample_inputs.append(tc["input"])
+        sample_outputs.append(tc["output"])
+
+    return sample_inputs, sample_outputs
+
+
+def extract_cases(content):
+    """
+    Extracts the sample inputs and outputs from the test case zip file into strings.
+
+    Params
+    ======
+    content: bytes
+        The contents of the zip file.
+
+    Returns
+    =======
+    sample_inputs: []
+        Array of the sample inputs
+    sample_outputs: []
+        Array of the sample outputs, paired with sample_inputs
+    """
+    # Obtain zip file
+    zipfile = ZipFile(io.BytesIO(content))
+
+    zipfiles = []
+
+    for file_name in zipfile.namelist():
+
+        content = zipfile.open(file_name).read().decode('utf-8').strip()
+
+        # Only add if there's content
+        if content:
+            zipfiles.append((Path(file_name).name, content))
+
+    return pair_cases(zipfiles)
+
+
+def stream_cases(f):
+    """
+    Identifies the sample inputs and outputs in the test case zip file without reading them into memory. The cases are streamed from the zip file when written, see writers.TestCaseWriter.
+
+    Params
+    ======
+    f: file
+        The zip file, opened in binary mode. It must stay open until the cases are written.
+
+    Returns
+    =======
+    sample_inputs: []
+        Array of Member of the sample inputs
+    sample_outputs: []
+        Array of Member of the sample outputs, paired with sample_inputs
+    """
+    zipfile = ZipFile(f)
+
+    zipfiles = []
+
+    for file_name in zipfile.namelist():
+        member = Member(zipfile, file_name)
+
+        # Only add if there's content
+        if not member.empty():
+            zipfiles.append((Path(file_name).name, member))
+
+    return pair_cases(zipfiles)
+
+
+# === Member Class ===
+class Member():
+    """
+    A file in a zip file, streamed on demand.
+    """
+    def __init__(self, zipfile, name):
+        self.zipfile = zipfile
+        self.name = name
+
+
+    def open(self):
+        """
+        Opens the file for reading in binary mode.
+        """
+        return self.zipfile.open(self.name)
+
+
+    def empty(self):
+        """
+        Returns whether the file only contains whitespace, reading only as far as its first non-whitespace byte.
+        """
+        with self.open() as fr:
+            for chunk in iter(lambda: fr.read(CHUNK_SIZE), b""):
+                if chunk.strip():
+                    return False
+
+        return True
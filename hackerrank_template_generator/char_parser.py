@@ -1,5 +1,8 @@
 # === Parser Class ===
-import string 
+import string
+
+# Characters replaced regardless of the wild character, e.g. the non-breaking spaces of code rendered in the browser
+REPLACEMENTS = {"\xa0": " "}
 
 class Parser():
     """
@@ -11,8 +14,11 @@ class Parser():
         """
         self.printables = printables if printables else set(string.printable)
 
+        # Translation tables, by wild character
+        self.tables = {}
+
 
-    def parse(self, s, wild=" "): 
+    def parse(self, s, wild=" "):
         """
         Returns a string that is parsed. All non-printables are replaced with wild.
 
@@ -28,9 +34,26 @@ class Parser():
         new_string: str
             Parsed string
         """
-        new_string = ""
+        if wild not in self.tables:
+            self.tables[wild] = Table(self.printables, wild)
+
+        return s.translate(self.tables[wild])
+
+
+# === Table Class ===
+class Table(dict):
+    """
+    A translation table for str.translate, mapping each character to itself if it is printable, or to the wild character otherwise. Characters are looked up once, then cached.
+    """
+    def __init__(self, printables, wild):
+        super().__init__({ord(k): v for k, v in REPLACEMENTS.items()})
+
+        self.printables = printables
+        self.wild = wild
+
 
-        for i in s: 
-            new_string += i if i in self.printables else wild
+    def __missing__(self, key):
+        c = chr(key)
+        self[key] = c if c in self.printables else self.wild
 
-        return new_string
\ No newline at end of file
+        return self[key]
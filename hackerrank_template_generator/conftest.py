@@ -0,0 +1,16 @@
+# === py.test options ===
+"""
+Command line options of py.test for test_functions.py, e.g.
+    py.test --no-cache
+to run every case, ignoring the results cached by previous runs.
+"""
+import test_functions as tf
+
+
+def pytest_addoption(parser):
+    parser.addoption("--no-cache", action="store_true", help="Run every case, ignoring the results cached by previous runs.")
+
+
+def pytest_configure(config):
+    if config.getoption("--no-cache"):
+        tf.RESULTS_CACHE = None
@@ -1,20 +1,31 @@
 # === Console printing class ===
+import time
+
 class Console(): 
     """
     A class to handle console messages.
     """
-    def __init__(self, tags=True):
+    def __init__(self, tags=True, verbose=True, timed=False):
         """
         Constructor class. Instantiates the tags.
+
+        If verbose is False, nothing is printed, though failures are still raised. If timed is True, the time each task took is printed with its result.
         """
+        self.verbose = verbose
+        self.timed = timed
+
+        # (task, seconds) tuples of the finished tasks
+        self.timings = []
+
         # Instantiate tags
-        self.running, self.success_message, self.failure_message = ("", "", "")
+        self.running_message, self.success_message, self.failure_message, self.fallback_message = ("", "", "", "")
 
         if tags: 
             # Enable tags
             self.running_message = "[RUNNING]"
             self.success_message = "[SUCCESS]"
             self.failure_message = "[FAILED]"
+            self.fallback_message = "[FALLBACK]"
 
     
     def start(self, s):
@@ -22,15 +33,26 @@ class Console():
         Prints s to the console. The default is 'Running'.
         """
         self.task = s
+        self.start_time = time.perf_counter()
 
-        print(f"{self.running_message} {s}", end="\r")
+        if self.verbose:
+            print(f"{self.running_message} {s}", end="\r")
+
+
+    def progress(self, s):
+        """
+        Edits the current line to show the progress s of the current message.
+        """
+        if self.verbose:
+            print(f"{self.running_message} {self.task}: {s}", end="\r")
 
 
     def success(self):
         """
         Edits the current line to a success of the current message.
         """
-        print(f"{self.success_message} {self.task}")
+        if self.verbose:
+            print(f"{self.success_message} {self.task}{self.elapsed()}")
 
 
     def failure(self, e=None): 
@@ -39,7 +61,26 @@ class Console():
 
         Raises an optional error, e.
         """
-        print(f"{self.failure_message} {self.task}")
+        if self.verbose:
+            print(f"{self.failure_message} {self.task}{self.elapsed()}")
 
         if e: 
-            raise e
\ No newline at end of file
+            raise e
+
+
+    def fallback(self, s):
+        """
+        Edits the current line to show that the current message did not succeed, and that s is tried instead. Nothing is raised, so that the failure is only reported once every alternative has failed.
+        """
+        if self.verbose:
+            print(f"{self.fallback_message} {self.task}{self.elapsed()}, {s}")
+
+
+    def elapsed(self):
+        """
+        Records the time the current task took, returning it as a suffix to print if timed.
+        """
+        seconds = time.perf_counter() - self.start_time
+        self.timings.append((self.task, seconds))
+
+        return f" ({seconds * 1000:.0f} ms)" if self.timed else ""
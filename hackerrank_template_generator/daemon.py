@@ -0,0 +1,499 @@
+# === Driver Daemon ===
+"""
+A long-lived daemon that keeps warm browser sessions and leases them to clients over a Unix socket, so that Firefox starts once rather than once per challenge.
+
+download.py spawns it on first use when it is enabled, and it shuts down by itself after being idle for a while. It can also be managed with
+    python daemon.py serve
+    python daemon.py status
+    python daemon.py stop
+"""
+from pathlib import Path
+import os
+import sys
+import json
+import getpass
+import stat
+import socket
+import socketserver
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from argparse import ArgumentParser
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from driver import Driver, DriverPool
+
+# The socket of the daemon of the current user, in a folder private to the user: the user's runtime folder if the system has one, or else a folder of the user in the shared temporary folder, see private_dir()
+SOCKET_DIR = Path(os.environ.get("XDG_RUNTIME_DIR") or Path(tempfile.gettempdir()) / f"hackerrank-driver-{getpass.getuser()}")
+SOCKET_PATH = SOCKET_DIR / "hackerrank-driver.sock"
+
+
+def private_dir(path):
+    """
+    Creates the folder at path, accessible by the current user only, or checks that the existing folder is, so that no other user can bind or replace the socket in it.
+
+    Raises
+    ======
+    PermissionError:
+        If the folder is not a folder of the current user, e.g. a link, or other users may access it.
+    """
+    try:
+        os.mkdir(path, 0o700)
+
+    except FileExistsError:
+        pass
+
+    st = os.lstat(path)
+
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"The folder '{path}' of the daemon's socket must be a folder of the current user, private to it.")
+
+
+def available():
+    """
+    Returns whether the daemon can run on this system, i.e. whether it has Unix sockets.
+    """
+    return hasattr(socket, "AF_UNIX") and os.name != "nt"
+
+
+# === Protocol ===
+# Each message is a JSON object on its own line
+def send(f, message):
+    """
+    Sends the message to the binary file-like f.
+    """
+    f.write(json.dumps(message).encode("utf-8") + b"\n")
+    f.flush()
+
+
+def receive(f):
+    """
+    Receives a message from the binary file-like f.
+
+    Raises
+    ======
+    ConnectionError:
+        If the other end has disconnected.
+    """
+    line = f.readline()
+
+    if not line:
+        raise ConnectionError("The connection was closed.")
+
+    return json.loads(line)
+
+
+# === Daemon Class ===
+class Daemon():
+    """
+    Serves browser sessions from a DriverPool over a Unix socket.
+
+    A client leases a session by sending {"op": "acquire"}, and gets the address of its geckodriver and its session id to attach to. The session is returned once the client sends {"op": "release"} or disconnects, after which it is reset for the next client. Sessions whose browser has crashed are replaced when next leased.
+    """
+    def __init__(self, path=SOCKET_PATH, sessions=2, idle_minutes=30, recycle=200, gecko=None):
+        """
+        Constructor class.
+
+        Params
+        ======
+        path: str
+            The path of the Unix socket.
+        sessions: int
+            The maximum number of browser sessions running at the same time.
+        idle_minutes: float
+            The number of minutes without leases after which the daemon shuts down.
+        recycle: int
+            The number of leases a session serves before its browser is restarted.
+        gecko: str
+            Path to the geckodriver. The parent folders are searched when the first session starts if it is None.
+        """
+        self.path = Path(path)
+        self.pool = DriverPool(sessions, recycle, gecko)
+        self.idle = idle_minutes * 60
+
+        self.leases = 0
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+        self.server = None
+
+
+    def serve(self):
+        """
+        Serves leases until stopped or idle for too long, then quits all browsers.
+
+        Raises
+        ======
+        Exception:
+            If another daemon is already serving on the socket.
+        """
+        private_dir(self.path.parent)
+
+        # A socket left behind by a daemon that did not shut down cleanly is replaced
+        if self.path.exists():
+            if running(self.path):
+                raise Exception(f"A daemon is already serving on {self.path}.")
+
+            self.path.unlink()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                daemon.handle(self.rfile, self.wfile)
+
+        self.server = socketserver.ThreadingUnixStreamServer(str(self.path), Handler)
+        self.server.daemon_threads = True
+
+        # Only the current user may lease sessions
+        os.chmod(self.path, 0o600)
+
+        threading.Thread(target=self.shutdown_when_idle, daemon=True).start()
+
+        try:
+            self.server.serve_forever()
+
+        finally:
+            self.server.server_close()
+            self.pool.close()
+
+            self.path.unlink(missing_ok=True)
+
+
+    def handle(self, rfile, wfile):
+        """
+        Serves the requests of a client until it disconnects. A client leases at most one session at a time.
+        """
+        while True:
+            try:
+                request = receive(rfile)
+
+            except (ConnectionError, ValueError):
+                return
+
+            op = request.get("op")
+
+            if op == "acquire":
+                self.lease(rfile, wfile)
+
+            elif op == "status":
+                send(wfile, {"ok": True, "sessions": self.pool.size, "leases": self.leases})
+
+            elif op == "stop":
+                send(wfile, {"ok": True})
+
+                # shutdown() waits for serve_forever() to return, so it cannot be called from a request
+                threading.Thread(target=self.server.shutdown).start()
+
+                return
+
+            else:
+                send(wfile, {"ok": False, "error": f"Unknown request {op!r}."})
+
+
+    def lease(self, rfile, wfile):
+        """
+        Leases a session to the client, blocking until one is free, and takes it back once the client releases it or disconnects.
+        """
+        with self.lock:
+            self.leases += 1
+
+        try:
+            with self.pool.driver() as d:
+                send(wfile, {"ok": True, "url": d.d.command_executor._url, "session": d.d.session_id})
+
+                # The client drives the browser until it releases the session
+                try:
+                    receive(rfile)
+                    released = True
+
+                except (ConnectionError, ValueError, OSError):
+                    released = False
+
+                # A session that cannot be reset is discarded by the pool
+                d.reset()
+
+                if released:
+                    send(wfile, {"ok": True})
+
+        except Exception as e:
+            try:
+                send(wfile, {"ok": False, "error": str(e) or repr(e)})
+
+            except OSError:
+                pass
+
+        finally:
+            with self.lock:
+                self.leases -= 1
+                self.last_used = time.monotonic()
+
+
+    def shutdown_when_idle(self):
+        """
+        Shuts the server down once it has had no leases for the idle time.
+        """
+        while True:
+            time.sleep(min(60, self.idle / 4))
+
+            with self.lock:
+                idle = self.leases == 0 and time.monotonic() - self.last_used > self.idle
+
+            if idle:
+                self.server.shutdown()
+
+                return
+
+
+# === Client ===
+def running(path=SOCKET_PATH):
+    """
+    Returns whether a daemon is serving on the socket.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(str(path))
+
+    except OSError:
+        return False
+
+    return True
+
+
+def spawn(path=SOCKET_PATH, sessions=2, idle_minutes=30, recycle=200):
+    """
+    Starts a daemon in the background, detached from the current process.
+    """
+    args = [sys.executable, str(Path(__file__).resolve()), "serve", "--socket", str(path), "--sessions", str(sessions), "--idle-minutes", str(idle_minutes), "--recycle", str(recycle)]
+
+    subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def connect(path=SOCKET_PATH, options=None, timeout=30):
+    """
+    Connects to the daemon, spawning it first if it is not running.
+
+    Params
+    ======
+    path: str
+        The path of the Unix socket.
+    options: {}
+        The sessions, idle_minutes and recycle options to spawn the daemon with. If None, the daemon is not spawned.
+    timeout: float
+        The number of seconds to wait for a spawned daemon to start serving.
+
+    Returns
+    =======
+    s: socket
+        The connected socket.
+
+    Raises
+    ======
+    PermissionError:
+        If the folder of the socket is not private to the current user.
+    """
+    # A socket in a folder other users can write to may not be the daemon's
+    private_dir(Path(path).parent)
+
+    deadline = time.monotonic() + timeout
+    spawned = False
+
+    while True:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            s.connect(str(path))
+
+            return s
+
+        except OSError:
+            s.close()
+
+            if options is None:
+                raise
+
+        if not spawned:
+            spawn(path, **options)
+            spawned = True
+
+        if time.monotonic() > deadline:
+            raise Exception(f"The driver daemon did not start on {path}.")
+
+        time.sleep(0.1)
+
+
+def request(op, path=SOCKET_PATH):
+    """
+    Sends a single request other than "acquire" to the daemon, returning its response.
+    """
+    with connect(path) as s, s.makefile("rwb") as f:
+        send(f, {"op": op})
+
+        return receive(f)
+
+
+class AttachedWebDriver(WebDriver):
+    """
+    A remote webdriver attached to an existing browser session, instead of starting a new one.
+    """
+    def __init__(self, url, session_id):
+        self.attached_session = session_id
+
+        super().__init__(command_executor=url, desired_capabilities={}, keep_alive=True)
+
+
+    def start_session(self, capabilities, browser_profile=None):
+        self.session_id = self.attached_session
+        self.w3c = True
+
+
+class DaemonDriver(Driver):
+    """
+    A Driver attached to a warm browser session leased from the daemon. Closing or quitting it returns the session to the daemon, leaving the browser running.
+    """
+    def __init__(self, path=SOCKET_PATH, options=None, link=None):
+        """
+        Constructor class. Leases a session, spawning the daemon first if it is not running and options are given.
+
+        Params
+        ======
+        path: str
+            The path of the Unix socket.
+        options: {}
+            The options to spawn the daemon with, see connect().
+        link: str
+            Optional link to move to
+        """
+        self.sock = connect(path, options)
+        self.f = self.sock.makefile("rwb")
+
+        send(self.f, {"op": "acquire"})
+        lease = receive(self.f)
+
+        if not lease["ok"]:
+            self.release()
+
+            raise Exception(f"The driver daemon could not lease a session: {lease['error']}")
+
+        self.d = AttachedWebDriver(lease["url"], lease["session"])
+
+        # Move to link
+        if link:
+            self.goto(link)
+
+
+    def release(self):
+        """
+        Returns the session to the daemon.
+        """
+        if self.f is None:
+            return
+
+        try:
+            send(self.f, {"op": "release"})
+            receive(self.f)
+
+        # The daemon takes the session back when the connection closes anyway
+        except (OSError, ValueError):
+            pass
+
+        finally:
+            self.f.close()
+            self.sock.close()
+            self.f = None
+
+
+    def close(self):
+        """
+        Returns the session to the daemon.
+        """
+        self.release()
+
+
+    def quit(self):
+        """
+        Returns the session to the daemon.
+        """
+        self.release()
+
+
+# === Daemon pool ===
+class DaemonPool():
+    """
+    A stand-in for DriverPool that leases each driver from the daemon, which bounds the number of browsers.
+    """
+    def __init__(self, path=SOCKET_PATH, options=None):
+        """
+        Params
+        ======
+        path: str
+            The path of the Unix socket.
+        options: {}
+            The options to spawn the daemon with, see connect().
+        """
+        self.path = path
+        self.options = options
+
+
+    @contextmanager
+    def driver(self):
+        """
+        Leases a driver from the daemon, blocking until one is free.
+
+        Yields
+        ======
+        _: DaemonDriver
+            The leased driver
+        """
+        d = DaemonDriver(self.path, self.options)
+
+        try:
+            yield d
+
+        finally:
+            d.release()
+
+
+    def close(self):
+        """
+        Does nothing, as the browsers belong to the daemon.
+        """
+
+
+# === Script ===
+if __name__ == "__main__":
+    conf_file = Path().cwd() / "configs.json"
+    options = {"sessions": 2, "idle_minutes": 30, "recycle": 200}
+
+    if conf_file.exists():
+        with conf_file.open("r") as fr:
+            options.update({k: v for k, v in json.load(fr).get("daemon", {}).items() if k in options})
+
+    ap = ArgumentParser(description="Keeps warm browser sessions for download.py.")
+    ap.add_argument("command", choices=["serve", "status", "stop"])
+    ap.add_argument("--socket", default=str(SOCKET_PATH), help="Path of the Unix socket.")
+    ap.add_argument("--sessions", type=int, default=options["sessions"], help="Maximum number of browser sessions.")
+    ap.add_argument("--idle-minutes", type=float, default=options["idle_minutes"], help="Minutes without leases after which the daemon shuts down.")
+    ap.add_argument("--recycle", type=int, default=options["recycle"], help="Number of leases served before a browser is restarted.")
+
+    args = ap.parse_args()
+
+    if args.command == "serve":
+        Daemon(args.socket, args.sessions, args.idle_minutes, args.recycle).serve()
+
+    elif not running(args.socket):
+        print("The driver daemon is not running.")
+
+    elif args.command == "status":
+        status = request("status", args.socket)
+
+        print(f"The driver daemon is running with {status['sessions']} sessions, {status['leases']} leased or waiting.")
+
+    else:
+        request("stop", args.socket)
+
+        print("The driver daemon was stopped.")
@@ -1,301 +1,677 @@
 # === Imports ===
 from pathlib import Path
-import json 
+import json
 
 from console import Console
 from char_parser import Parser
-from driver import Driver, by
+from driver import Driver, DriverPool, by
+import daemon
 from writers import FolderWriter
-from soup import soup
-
-from sys import argv
-import requests
-import io 
-from zipfile import ZipFile
-
-import re
+from page import Page, TITLE_CLASS, LANG_BOX_CLASS, LANG_LIST_ELEMENT_CLASS
+from challenge import split_code, stream_cases, EDITOR_MODEL_SCRIPT, EDITOR_CLASS
+from fetch import Fetcher
+from cache import Cache
+from store import ObjectStore
+from downloader import Downloader
+
+from argparse import ArgumentParser
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import asyncio
+from datetime import datetime
+from selenium.common.exceptions import TimeoutException
 
 # === Setup ===
 # Load configs
 conf_file = Path().cwd() / "configs.json"
 
-with conf_file.open("r") as fr: 
+with conf_file.open("r") as fr:
     configs = json.load(fr)
 
 website_link = configs["website_link"]
 
-# === Script ===
-if __name__ == "__main__":
+# Seconds each stage of scraping waits for the elements it needs: the rendered page, the login prompt, the language list and the editor
+WAITS = {"page": 15, "prompt": 2, "languages": 5, "editor": 10}
+
+# Options the driver daemon is spawned with
+daemon_options = {k: v for k, v in configs["daemon"].items() if k != "enabled"}
+
+# Shared store the test cases of every workspace are kept in, next to the difficulty folders
+case_store = ObjectStore(Path().cwd().parent.parent / configs["store"]["path"]) if configs["store"]["enabled"] else None
+
+
+# === Scrape ===
+def scrape(link, d, p, c):
+    """
+    Scrapes the challenge at the given link with the given driver.
+
+    Params
+    ======
+    link: str
+        The link to the challenge.
+    d: Driver
+        The driver to scrape with. It is left open.
+    p: Parser
+        The string parser.
+    c: Console
+        The console to report each stage to.
+
+    Returns
+    =======
+    challenge: dict
+        The challenge information, with the following fields:
+         - "title": The challenge title
+         - "difficulty": The difficulty level
+         - "imports": The import lines of the online code
+         - "function": The function definition line of the online code
+         - "main": The lines of the online code from if __name__ == '__main__' onwards
+         - "samples_link": The link to the sample test case zip file
+         - "page": The page snapshot
+    """
+    # === Connect to website ===
+    c.start(f"Connecting to {configs['website_name']}")
+
+    try:
+        d.goto(link)
+
+        # The challenge information is read once the page is rendered
+        for element in [TITLE_CLASS, LANG_BOX_CLASS]:
+            d.wait(by("class_name"), element, WAITS["page"])
+
+        # Skip login prompt, if shown
+        X_BUTTON_CLASS = "close-icon"
 
-    # === Set up console ===
-    c = Console()
+        try:
+            d.wait(by("class_name"), X_BUTTON_CLASS, WAITS["prompt"]).click()
 
-    # === Obtain and verify script arguments ===
-    c.start("Verifying script arguments")
+        except TimeoutException:
+            pass
 
-    # Only the link needs to be passed.
-    try: 
-        assert len(argv) == 2, "Incorrect number of arguments passed."
     except Exception as e:
         c.failure(e)
 
-    # Load link
-    link = argv[1].strip()
-    
     c.success()
 
-    # === Set up Parser() resource ===
-    c.start("Setting up string parser resources")
-    
-    try: 
-        p = Parser()
+    # === Verify programming language ===
+    lang = configs['language']
+
+    c.start(f"Verifying programming language: {lang}")
+
+    try:
+        page = Page(d.source())
+
+        # Check that the correct language is selected
+        if page.language != lang:
+            # The current language is not our language
+
+            # Click on the language box
+            d.d.find_element_by_class_name(LANG_BOX_CLASS).click()
+
+            # Identify correct language in the opened list
+            d.wait(by("class_name"), LANG_LIST_ELEMENT_CLASS, WAITS["languages"])
 
-    except Exception as e: 
-        c.failure(e) 
+            CORRECT_LANG_ID = Page(d.source()).languages.get(lang)
+
+            assert CORRECT_LANG_ID is not None, "The desired programming language could not be found."
+
+            # Set to correct language
+            d.d.find_element_by_id(CORRECT_LANG_ID).click()
+
+            # The editor now holds the template of the language
+            d.wait(by("class_name"), EDITOR_CLASS, WAITS["editor"])
+
+            page = Page(d.source())
+
+    except Exception as e:
+        c.failure(e)
 
     c.success()
 
-    # === Set up Driver() resource ===
-    c.start("setting up driver resources")
+    # === Identify challenge information ===
+    # --- Title ---
+    c.start("Identifying challenge information: Title")
 
-    try: 
-        d = Driver()
+    try:
+        challenge_title = page.title
 
     except Exception as e:
-        c.failure(e) 
+        c.failure(e)
 
     c.success()
 
-    # Encompass the code in a try-except to force driver shutdown
-    try: 
-        
-        # === Connect to website ===
-        c.start(f"Connecting to {configs['website_name']}")
+    # --- Difficulty ---
+    c.start("Identifying challenge information: Difficulty")
 
-        try: 
-            d.goto(link)
+    try:
+        difficulty = page.difficulty
 
-            # Skip login prompt
-            X_BUTTON_CLASS = "close-icon"
+    except Exception as e:
+        c.failure(e)
 
-            d.wait(by("class_name"), X_BUTTON_CLASS).click()
+    c.success()
 
-        except Exception as e:
-            c.failure(e)
+    # --- Inputs and outputs ---
+    c.start("Identifying challenge information: Sample inputs and outputs")
 
-        c.success()
+    try:
+        # The zip file is downloaded separately, see download_samples()
+        samples_link = f"{website_link}{page.samples_link}"
 
-        # === Verify programming language ===
-        lang = configs['language']
+    except Exception as e:
+        c.failure(e)
 
-        c.start(f"Verifying programming language: {lang}")
+    c.success()
 
-        try: 
-            bs = soup(d.source())
+    # === Read online editor code ===
+    c.start("Parsing online code")
 
-            # Check that the correct language is selected
-            LANG_BOX_CLASS = "css-1hwfws3"
+    try:
+        # === Online code ===
+        d.wait(by("class_name"), EDITOR_CLASS, WAITS["editor"])
 
-            if bs.find("div", {"class": LANG_BOX_CLASS}) != lang:
-                # The current language is not our language
+        # The whole template is read from the editor's model in one call
+        try:
+            code = d.script(EDITOR_MODEL_SCRIPT)
 
-                # Click on the language box
-                d.d.find_element_by_class_name(LANG_BOX_CLASS).click()
+        except Exception:
+            code = None
 
-                # Identify correct language
-                LANG_LIST_ELEMENT_CLASS = "css-m62ux7"
-                CORRECT_LANG_ID = None
+        if code:
+            editor_contents = code.replace("\r\n", "\n").split("\n")
 
-                languages = soup(d.source()).find("div", {"class": LANG_LIST_ELEMENT_CLASS}).findChildren()
+        # Otherwise, fall back to the lines the editor renders, from a snapshot taken once the editor is in
+        else:
+            page = Page(d.source())
+            editor_contents = page.editor
 
-                for l in languages:
-                    if l.getText() == lang:
-                        CORRECT_LANG_ID = l.attrs["id"]
+        # Break into imports, def, and main
+        imports, function, main = split_code(editor_contents, p)
 
-                assert CORRECT_LANG_ID is not None, "The desired programming language could not be found."
+    except Exception as e:
+        c.failure(e)
 
-                # Set to correct language
-                d.d.find_element_by_id(CORRECT_LANG_ID).click()
+    c.success()
 
-        except Exception as e: 
-            c.failure(e)
+    return {
+        "title": challenge_title,
+        "difficulty": difficulty,
+        "imports": imports,
+        "function": function,
+        "main": main,
+        "samples_link": samples_link,
+        "page": page.source
+    }
+
+
+# === Fetch ===
+def fetch(link, fetcher, p, c, fallback=None):
+    """
+    Fetches the challenge at the given link over HTTP, without a browser.
+
+    Params
+    ======
+    link: str
+        The link to the challenge.
+    fetcher: Fetcher
+        The HTTP fetcher.
+    p: Parser
+        The string parser.
+    c: Console
+        The console to report to.
+    fallback: str
+        The alternative tried if the fetch fails, e.g. "falling back to the driver", reported instead of a failure. The error is still raised.
+
+    Returns
+    =======
+    challenge: dict
+        The challenge information, as returned by scrape().
+    """
+    c.start("Fetching challenge information over HTTP")
+
+    try:
+        challenge = fetcher.challenge(link, p)
 
-        c.success()
+    except Exception as e:
+        if fallback:
+            c.fallback(f"{fallback} after {e!r}")
 
-        # === Identify challenge information ===
-        # --- Title ---
-        c.start("Identifying challenge information: Title")
+            raise e
 
-        try: 
+        c.failure(e)
 
-            TITLE_CLASS = "text-headline"
-            challenge_title = bs.find("div", {"class": TITLE_CLASS}).getText()    
-        
-        except Exception as e: 
-            c.failure(e)
+    c.success()
 
-        c.success()
+    return challenge
 
-        # --- Difficulty ---
-        c.start("Identifying challenge information: Difficulty")
 
-        try: 
-            DIFF_BLOCK_CLASS = [
-                "sidebar-problem-difficulty",
-                "challenge-sidebar-help"
-            ]
-            DIFF_BLOCK_LEVEL_CLASS = "pull-right"
+# === Samples ===
+def download_samples(challenge, c):
+    """
+    Downloads the sample test case zip file of the challenge into a temporary file at challenge["samples"], showing the throughput. Dropped connections resume where they stopped, and the zip file's CRCs are verified before extraction.
+    """
+    c.start("Downloading sample inputs and outputs")
 
-            diff_block = bs.find("div", {"class": DIFF_BLOCK_CLASS})
+    def progress(received, total, rate):
+        size = f"{received / 1024 / 1024:.1f}" + (f"/{total / 1024 / 1024:.1f}" if total else "")
 
-            diff_block = list(filter(lambda x: "Difficulty" in x.getText(), diff_block))[0].find("p", {"class": DIFF_BLOCK_LEVEL_CLASS})
+        c.progress(f"{size} MB at {rate / 1024 / 1024:.1f} MB/s")
 
-            difficulty = diff_block.getText()
+    d = Downloader()
 
-        except Exception as e: 
-            c.failure(e)
+    try:
+        challenge["samples"] = d.download(challenge["samples_link"], progress)
+
+    except Exception as e:
+        c.failure(e)
+
+    finally:
+        d.close()
+
+    c.success()
+
+
+def extract_samples(challenge, c):
+    """
+    Identifies the sample inputs and outputs of the challenge in its zip file, at challenge["inputs"] and challenge["outputs"]. They are streamed from the zip file when the workspace is written.
+    """
+    c.start("Extracting sample inputs and outputs")
+
+    try:
+        challenge["inputs"], challenge["outputs"] = stream_cases(challenge["samples"])
+
+    except Exception as e:
+        c.failure(e)
+
+    c.success()
 
+
+# === Cache ===
+def load_cached(link, cache, c):
+    """
+    Loads the challenge at the given link from the cache.
+
+    Returns
+    =======
+    challenge: dict
+        The challenge information, as returned by scrape() with its opened zip file under "samples", or None if it is not cached.
+    """
+    c.start("Loading challenge information from cache")
+
+    try:
+        challenge = cache.get(link, configs["language"])
+
+    except Exception as e:
+        c.failure(e)
+
+    # Only report hits
+    if challenge is not None:
         c.success()
 
-        # --- Inputs and outputs ---
-        c.start("Identifying challenge information: Sample inputs and outputs")
+    return challenge
 
-        try: 
-            bs = soup(d.source())        
 
-            # --- Sample inputs and outputs ---
-            SAMPLES_DOWNLOAD_ID = "test-cases-link"
-            samples_link = bs.find("a", id=SAMPLES_DOWNLOAD_ID)
+def store_cached(link, challenge, cache, c):
+    """
+    Stores the challenge at the given link in the cache.
+    """
+    c.start("Caching challenge information")
 
-            assert samples_link.attrs["href"]
+    try:
+        cache.put(link, configs["language"], challenge)
 
-            # Download
-            samples_link = f"{website_link}{samples_link.attrs['href']}"
+    except Exception as e:
+        c.failure(e)
 
-            headers = {'User-Agent': 'Mozilla'}
-            samples = requests.get(samples_link, stream=True, headers=headers)
+    c.success()
 
-            # Obtain zip file
-            zipfile = ZipFile(io.BytesIO(samples.content))
 
-            zip_names = zipfile.namelist()
+# === Workspace ===
+def setup_workspace(link, challenge, c):
+    """
+    Writes the workspace of a scraped challenge into its difficulty folder.
+
+    Params
+    ======
+    link: str
+        The link to the challenge.
+    challenge: dict
+        The challenge information, as returned by scrape(), with the extracted sample inputs and outputs.
+    c: Console
+        The console to report to.
+    """
+    c.start("Setting up workspace")
+
+    # Set destination into the difficulty level
+    dest = Path().cwd().parent.parent / challenge["difficulty"]
+
+    try:
+        fw = FolderWriter(
+            dest,
+            challenge["title"],
+            link,
+            challenge["imports"],
+            challenge["function"],
+            challenge["main"],
+            challenge["inputs"],
+            challenge["outputs"],
+            case_store,
+            configs["cases"]["compression"]
+        )
+        fw.write()
 
-            zipfiles = []
+    except Exception as e:
+        c.failure(e)
 
-            for file_name in zip_names: 
-                
-                name = Path(file_name).name
-                content = zipfile.open(file_name).read().decode('utf-8').strip()
+    c.success()
 
-                # Only add if there's content
 
-                if content: 
+# === Batch ===
+def read_links(f):
+    """
+    Reads the challenge links from the file f, or from stdin if f is '-'. Blank lines and lines starting with '#' are skipped.
+
+    Returns
+    =======
+    links: []
+        Array of links
+    """
+    if f == "-":
+        lines = sys.stdin.readlines()
+
+    else:
+        with open(f, "r") as fr:
+            lines = fr.readlines()
+
+    lines = [l.strip() for l in lines]
+
+    return [l for l in lines if l and not l.startswith("#")]
+
+
+def batch(links, workers=2, recycle=20, backend="auto", website=website_link, cache=None, refresh=False, use_daemon=False, lean=True):
+    """
+    Sets up the workspaces of all links in parallel. A failure on one link does not stop the others. Repeated links are set up once, and the workspaces of links to the same challenge are written one at a time.
+
+    Each link goes through a pipeline: its challenge information is fetched on a thread, sharing a pooled HTTP session and a bounded pool of drivers; its zip file is then downloaded asynchronously alongside the others; and its workspace is written as soon as its download completes.
+
+    Params
+    ======
+    links: []
+        Array of links to the challenges.
+    workers: int
+        The number of challenges, and at most drivers, being fetched in parallel. This is also the limit of concurrent downloads.
+    recycle: int
+        The number of pages each driver serves before it is restarted.
+    backend: str
+        "http", "driver", or "auto" to fall back to the driver only if the HTTP fetch fails.
+    website: str
+        The website the HTTP backend fetches from.
+    cache: Cache
+        The cache to load challenges from and store them in, if any.
+    refresh: bool
+        Whether to skip loading from the cache, fetching every challenge again.
+    use_daemon: bool
+        Whether to lease drivers from the driver daemon instead of starting them, in which case the daemon bounds the number of drivers and recycles them.
+    lean: bool
+        Whether started drivers use the lean profile, see Driver.
+
+    Returns
+    =======
+    failures: {}
+        Dictionary of link to the exception raised for it.
+    """
+    # Links differing only by a trailing slash are the same challenge
+    links = list(dict.fromkeys(link.rstrip("/") for link in links))
+
+    p = Parser()
+    fetcher = Fetcher(website, configs["language"], pool_size=workers) if backend != "driver" else None
+    pool = None
+
+    if backend != "http":
+        pool = daemon.DaemonPool(options=daemon_options) if use_daemon else DriverPool(workers, recycle, lean=lean)
+    downloader = Downloader(per_host=workers, workers=workers)
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def identify(link):
+        # Stages are silenced, as the parallel runs would otherwise overwrite each other's lines
+        c = Console(verbose=False)
+        challenge = None
+
+        if cache and not refresh:
+            challenge = load_cached(link, cache, c)
+
+            if challenge is not None:
+                return challenge, True
+
+        if fetcher:
+            try:
+                challenge = fetch(link, fetcher, p, c)
+
+            except Exception:
+                if not pool:
+                    raise
+
+        if challenge is None:
+            with pool.driver() as d:
+                challenge = scrape(link, d, p, c)
+
+        return challenge, False
+
+    # A lock for each workspace folder, so that equivalent links, e.g. of a challenge and of its contest, do not write the same workspace at the same time
+    targets = {}
+    targets_lock = threading.Lock()
+
+    def finish(link, challenge, cached):
+        c = Console(verbose=False)
+
+        with targets_lock:
+            target = targets.setdefault((challenge["difficulty"], challenge["title"]), threading.Lock())
 
-                    zipfiles.append({
-                        "name": name,
-                        "content": content
-                    })
+        try:
+            extract_samples(challenge, c)
 
-            # The files come in input00.txt and output00.txt format
-            # Thus, we want to assert that all files come in this format and match them to each other
-            test_cases = {}
+            if cache and not cached:
+                store_cached(link, challenge, cache, c)
 
-            for f in zipfiles: 
+            with target:
+                setup_workspace(link, challenge, c)
 
-                case_re = re.search("(output|input)(\d+).txt", f["name"])
+        finally:
+            challenge["samples"].close()
 
-                assert case_re, "Unsupported test case format."
+    failures = {}
 
-                case_type = case_re.group(1)
-                case_num = case_re.group(2)
+    async def run(link):
+        loop = asyncio.get_running_loop()
 
-                if case_num not in test_cases.keys():
-                    test_cases[case_num] = {}
+        try:
+            challenge, cached = await loop.run_in_executor(executor, identify, link)
 
-                test_cases[case_num][case_type] = f["content"]
+            if "samples" not in challenge:
+                challenge["samples"] = await downloader.fetch(challenge["samples_link"])
 
-            # Collected samples
-            sample_inputs = []
-            sample_outputs = []
+            await loop.run_in_executor(executor, finish, link, challenge, cached)
 
-            for tc in test_cases.values():
+            print(f"[SUCCESS] {challenge['title']} ({link})")
 
-                assert "input" in tc.keys() and "output" in tc.keys()
-                
-                sample_inputs.append(tc["input"])
-                sample_outputs.append(tc["output"])
-    
         except Exception as e:
-            c.failure(e) 
+            failures[link] = e
+
+            print(f"[FAILED] {link}: {e!r}")
+
+    async def run_all():
+        await asyncio.gather(*[run(link) for link in links])
+
+    start_time = datetime.now()
+
+    try:
+        asyncio.run(run_all())
+
+    finally:
+        executor.shutdown()
+        downloader.close()
+
+        if pool:
+            pool.close()
+
+    # Summarise throughput
+    minutes = (datetime.now() - start_time).total_seconds() / 60
+    done = len(links) - len(failures)
+
+    print(f"{done}/{len(links)} challenges set up in {minutes:.2f} minutes ({done / minutes if minutes else 0:.1f} challenges per minute).")
+
+    return failures
 
-        c.success()
 
-        # === Read online editor code ===
-        c.start("Parsing online code")
-        
-        try: 
-            # === Online code ===
-            bs = soup(d.source())
+# === Script ===
+if __name__ == "__main__":
 
-            EDITOR_CLASS = "view-lines"
-            EDITOR_LINE_CLASS = "view-line"
-            
-            editor_contents = bs.find("div", {"class": EDITOR_CLASS}).findAll("div", {"class": EDITOR_LINE_CLASS})
-            editor_contents = [t.getText() for t in editor_contents]
+    # === Set up console ===
+    c = Console()
 
-            # Break into imports, def, and main
-            imports = []
-            function = None
-            main = []
+    # === Obtain and verify script arguments ===
+    c.start("Verifying script arguments")
 
-            for lx, line in enumerate(editor_contents): 
-                # Parse
-                s = p.parse(line)
+    ap = ArgumentParser(description="Sets up HackerRank challenge workspaces.")
+    ap.add_argument("link", nargs="?", help="Link to the challenge.")
+    ap.add_argument("--batch", metavar="FILE", help="File with one link per line, or '-' for stdin.")
+    ap.add_argument("--workers", type=int, default=2, help="Number of challenges running in parallel in batch mode.")
+    ap.add_argument("--recycle", type=int, default=20, help="Number of pages served before a driver is restarted in batch mode.")
+    ap.add_argument("--backend", choices=["auto", "http", "driver"], default="auto", help="Fetch over HTTP, with the browser driver, or over HTTP falling back to the driver.")
+    ap.add_argument("--website", default=website_link, help="Website the HTTP backend fetches from, e.g. a local mock_server.py.")
+    ap.add_argument("--refresh", action="store_true", help="Fetch again instead of loading from the cache.")
+    ap.add_argument("--no-cache", action="store_true", help="Neither load from nor store in the cache.")
+    ap.add_argument("--daemon", action="store_true", help="Attach to the driver daemon for this run, even if it is not enabled in configs.json.")
+    ap.add_argument("--no-daemon", action="store_true", help="Start a browser for this run instead of attaching to the driver daemon.")
+    ap.add_argument("--no-lean", action="store_true", help="Start the browser with Firefox's default profile and wait for pages to fully load, e.g. to compare timings. Implies --no-daemon.")
+    ap.add_argument("--timings", action="store_true", help="Print the time each stage took.")
+
+    args = ap.parse_args()
+
+    c.timed = args.timings
+
+    # Either a link or a batch file needs to be passed.
+    try:
+        assert bool(args.link) != bool(args.batch), "Pass either a link or --batch, but not both."
+    except Exception as e:
+        c.failure(e)
 
-                if re.match("import", s):
-                    imports.append(s)
+    c.success()
 
-                elif re.match("def", s):
-                    function = s
+    # === Set up Cache() resource ===
+    cache = None
 
-                elif re.match("if __name__", s):
-                    main = editor_contents[lx:]
-                    main = [p.parse(l) for l in main]
+    if not args.no_cache:
+        c.start("Setting up cache resources")
 
-                    break
+        try:
+            cache = Cache(**configs["cache"])
 
         except Exception as e:
             c.failure(e)
 
         c.success()
 
-        # === Close driver ===
-        c.start("Closing driver")
+    # Attach to the warm browsers of the driver daemon if it is enabled, where it can run
+    use_daemon = (configs["daemon"]["enabled"] or args.daemon) and not (args.no_daemon or args.no_lean) and daemon.available()
+
+    # === Batch mode ===
+    if args.batch:
+        c.start("Reading batch links")
 
         try:
-            d.close()
+            links = read_links(args.batch)
 
-        except Exception as e: 
-            c.failure(e) 
+            assert links, "No links to set up."
+
+        except Exception as e:
+            c.failure(e)
 
         c.success()
 
-        # === Instantiate README ===
-        c.start("Setting up workspace")
-        
-        # Set destination into the difficulty level
-        dest = Path().cwd().parent.parent / difficulty
+        failures = batch(links, args.workers, args.recycle, args.backend, args.website, cache, args.refresh, use_daemon, not args.no_lean)
+
+        sys.exit(1 if failures else 0)
+
+    # Load link
+    link = args.link.strip()
+
+    # === Set up Parser() resource ===
+    c.start("Setting up string parser resources")
+
+    try:
+        p = Parser()
+
+    except Exception as e:
+        c.failure(e)
+
+    c.success()
+
+    challenge = None
+    cached = False
+
+    # === Load from cache ===
+    if cache and not args.refresh:
+        challenge = load_cached(link, cache, c)
+        cached = challenge is not None
+
+    # === Fetch over HTTP ===
+    if challenge is None and args.backend != "driver":
+        try:
+            # A failure is only reported once the driver has failed too, where it is allowed to
+            challenge = fetch(link, Fetcher(args.website, configs["language"]), p, c, None if args.backend == "http" else "falling back to the driver")
+
+        except Exception as e:
+            # Only fall back to the driver if allowed to
+            if args.backend == "http":
+                raise e
+
+    # === Fall back to the driver ===
+    if challenge is None:
+
+        # === Set up Driver() resource ===
+        c.start("Attaching to the driver daemon" if use_daemon else "setting up driver resources")
 
         try:
-            fw = FolderWriter(dest, challenge_title, link, imports, function, main, sample_inputs, sample_outputs)
-            fw.write()
+            d = daemon.DaemonDriver(options=daemon_options) if use_daemon else Driver(lean=not args.no_lean)
 
-        except Exception as e: 
-            c.failure(e) 
+        except Exception as e:
+            c.failure(e)
 
         c.success()
 
-    except Exception as e:
-        # d.close()
+        # Encompass the code in a try-except to force driver shutdown
+        try:
+
+            challenge = scrape(link, d, p, c)
+
+            # === Close driver ===
+            c.start("Closing driver")
+
+            try:
+                d.close()
+
+            except Exception as e:
+                c.failure(e)
+
+            c.success()
+
+        except Exception as e:
+            # d.close()
+
+            raise e
+
+    # === Sample inputs and outputs ===
+    if "samples" not in challenge:
+        download_samples(challenge, c)
+
+    extract_samples(challenge, c)
+
+    # === Cache challenge ===
+    if cache and not cached:
+        store_cached(link, challenge, cache, c)
+
+    # === Instantiate README ===
+    setup_workspace(link, challenge, c)
 
-        raise e
\ No newline at end of file
+    challenge["samples"].close()
@@ -0,0 +1,474 @@
+# === Downloader Class ===
+from pathlib import Path
+import os
+import re
+import shutil
+import json
+import time
+import hashlib
+import tempfile
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from zipfile import ZipFile, BadZipFile
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from challenge import CHUNK_SIZE
+
+# Folder of the partial downloads of the current user, kept between runs so that interrupted downloads resume
+# It is in the user's own cache folder, as other users could create or link a folder of a known name in the shared temporary folder first
+CACHE_HOME = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+PARTS_DIR = Path(CACHE_HOME) / "hackerrank-template-generator" / "downloads"
+
+
+class CorruptDownload(Exception):
+    """
+    A downloaded zip file failed its integrity check.
+    """
+
+
+class Downloader():
+    """
+    An asyncio-based downloader fetching many files concurrently over a shared connection pool.
+
+    The requests themselves run on a thread pool sharing one pooled session. Each host gets its own concurrency limit, and failed requests are retried with exponential backoff.
+
+    Downloads are written in chunks to a partial file. An interrupted download resumes from where it stopped with an HTTP Range request, and only counts as a failed attempt if it made no progress. Zip files have their CRCs verified before they are returned.
+    """
+    def __init__(self, per_host=4, workers=16, retries=3, backoff=0.5, timeout=30, parts=PARTS_DIR, verify_zip=True):
+        """
+        Constructor class. Sets up the pooled session and thread pool.
+
+        Params
+        ======
+        per_host: int
+            The maximum number of concurrent downloads from the same host.
+        workers: int
+            The maximum number of concurrent downloads in total.
+        retries: int
+            The number of times a failed download is retried.
+        backoff: float
+            The time in seconds before the first retry, doubled for every following retry.
+        timeout: float
+            The time in seconds to wait to connect and between received bytes.
+        parts: str
+            The folder of the partial downloads.
+        verify_zip: bool
+            Whether downloads are zip files, whose CRCs are checked once downloaded.
+        """
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.parts = Path(parts)
+        self.verify_zip = verify_zip
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Mozilla'})
+
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+        # Semaphores are created lazily, as they belong to the running event loop
+        self.hosts = {}
+
+        # The downloads in progress, by url, with the number of fetches sharing them
+        self.inflight = {}
+
+
+    def partial(self, url):
+        """
+        Returns the path of the partial download of the given url.
+        """
+        return self.parts / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]}.part"
+
+
+    def received(self, url):
+        """
+        Returns the number of bytes of the given url downloaded so far.
+        """
+        try:
+            return self.partial(url).stat().st_size
+
+        except FileNotFoundError:
+            return 0
+
+
+    def get(self, url, progress=None):
+        """
+        Downloads the given url into its partial file, blocking, resuming a previous attempt if any. Raises for any HTTP error, and if the connection drops, in which case the partial file is kept for the next attempt.
+
+        The partial file is locked while it is written. If another run is downloading the same url, the url is downloaded into a partial file of its own instead, which is not resumed.
+
+        Params
+        ======
+        url: str
+            The url to download.
+        progress: function
+            Called as progress(received, total, rate) after each chunk, with the bytes downloaded so far, the total bytes or None if unknown, and the throughput of this attempt in bytes per second.
+
+        Returns
+        =======
+        _: file
+            The downloaded content, rewound. It is deleted when closed.
+
+        Raises
+        ======
+        CorruptDownload:
+            If the zip file fails its integrity check, in which case the partial file is discarded.
+        """
+        # Partial downloads are private to the user
+        self.parts.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        part = self.partial(url)
+        lock = part.with_suffix(".lock")
+
+        # A holder of the lock touches it with every chunk, within the timeout, unless it stopped
+        if acquire(lock, self.timeout * 4):
+            try:
+                return self.receive(url, part, lock, progress)
+
+            finally:
+                lock.unlink(missing_ok=True)
+
+        with tempfile.NamedTemporaryFile(dir=self.parts, prefix=".tmp", suffix=".part", delete=False) as fw:
+            tmp = Path(fw.name)
+
+        try:
+            return self.receive(url, tmp, None, progress)
+
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+
+            raise
+
+
+    def receive(self, url, part, lock=None, progress=None):
+        """
+        Downloads the given url into the partial file part, see get().
+
+        Params
+        ======
+        lock: Path
+            The lock held on part, touched with every chunk, or None if part is not to be resumed.
+        """
+        meta_path = part.with_suffix(".json")
+
+        # The validator of the partial file, so that a file that changed on the server is not resumed
+        try:
+            assert lock is not None
+
+            with meta_path.open("r") as fr:
+                meta = json.load(fr)
+
+            assert meta["url"] == url
+
+        except (OSError, ValueError, KeyError, AssertionError):
+            meta = {"url": url, "validator": None}
+            part.unlink(missing_ok=True)
+
+        have = part.stat().st_size if part.exists() else 0
+        headers = {}
+
+        if have:
+            headers["Range"] = f"bytes={have}-"
+
+            if meta["validator"]:
+                headers["If-Range"] = meta["validator"]
+
+        start_time = time.perf_counter()
+        received = 0
+
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as r:
+
+            # The partial file already holds the whole content
+            if r.status_code == 416 and content_range(r)[2] == have:
+                total = have
+
+            else:
+                # A partial file the server cannot resume is started over
+                if r.status_code == 416:
+                    part.unlink(missing_ok=True)
+
+                r.raise_for_status()
+
+                if r.status_code == 206:
+                    first, _, total = content_range(r)
+
+                    if first != have:
+                        part.unlink(missing_ok=True)
+
+                        raise requests.ConnectionError(f"The server resumed from byte {first} instead of byte {have}.")
+
+                # The server sent the whole content, as it ignores ranges or the file changed
+                else:
+                    have = 0
+                    total = int(r.headers["Content-Length"]) if "Content-Length" in r.headers else None
+
+                meta["validator"] = r.headers.get("ETag") or r.headers.get("Last-Modified")
+
+                if lock is not None:
+                    with meta_path.open("w") as fw:
+                        json.dump(meta, fw)
+
+                with part.open("ab" if have else "wb") as fw:
+                    for chunk in r.iter_content(CHUNK_SIZE):
+                        fw.write(chunk)
+
+                        # Received bytes are kept, however the connection ends
+                        fw.flush()
+
+                        if lock is not None:
+                            lock.touch()
+
+                        have += len(chunk)
+                        received += len(chunk)
+
+                        if progress:
+                            progress(have, total, received / max(time.perf_counter() - start_time, 1e-9))
+
+                if total is not None and have < total:
+                    raise requests.ConnectionError(f"The connection closed after {have} of {total} bytes.")
+
+        f = part.open("rb")
+
+        try:
+            if self.verify_zip:
+                verify(f)
+
+        except BaseException:
+            f.close()
+            part.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+
+            raise
+
+        # The open file outlives its name, on systems that allow it
+        try:
+            part.unlink()
+            meta_path.unlink(missing_ok=True)
+
+        except OSError:
+            pass
+
+        return f
+
+
+    async def fetch(self, url, progress=None):
+        """
+        Downloads the given url within its host's concurrency limit, retrying with backoff on failure. Interrupted downloads resume, and only count as a failure if they made no progress.
+
+        Concurrent fetches of the same url share one download, each getting a file of its own.
+
+        Params
+        ======
+        url: str
+            The url to download.
+        progress: function
+            Called after each chunk, see get().
+
+        Returns
+        =======
+        _: file
+            The downloaded content in a temporary file, rewound
+
+        Raises
+        ======
+        requests.RequestException:
+            If the last retry fails.
+        CorruptDownload:
+            If the last download fails its integrity check.
+        """
+        shared = self.inflight.get(url)
+
+        if shared is None:
+            shared = self.inflight[url] = {"fetches": 0, "task": asyncio.ensure_future(self.share(url, progress))}
+
+        shared["fetches"] += 1
+
+        # Cancelling one fetch does not cancel the download of the others
+        files = await asyncio.shield(shared["task"])
+
+        return files.pop()
+
+
+    async def share(self, url, progress=None):
+        """
+        Downloads the given url for every fetch of it made in the meantime, see fetch().
+
+        Returns
+        =======
+        files: []
+            A file of the downloaded content for each fetch, rewound.
+        """
+        try:
+            f = await self.retry(url, progress)
+
+        finally:
+            # Later fetches of the url download it again
+            shared = self.inflight.pop(url)
+
+        loop = asyncio.get_running_loop()
+        files = [f]
+
+        for _ in range(shared["fetches"] - 1):
+            files.append(await loop.run_in_executor(self.executor, copy, f))
+
+        return files
+
+
+    async def retry(self, url, progress=None):
+        """
+        Downloads the given url, retrying with backoff on failure, see fetch().
+        """
+        host = urlparse(url).netloc
+
+        if host not in self.hosts:
+            self.hosts[host] = asyncio.Semaphore(self.per_host)
+
+        loop = asyncio.get_running_loop()
+
+        failures = 0
+
+        while True:
+            before = self.received(url)
+
+            try:
+                async with self.hosts[host]:
+                    return await loop.run_in_executor(self.executor, self.get, url, progress)
+
+            except (requests.RequestException, CorruptDownload):
+                if self.received(url) <= before:
+                    failures += 1
+
+                if failures > self.retries:
+                    raise
+
+            # Back off outside the semaphore so other downloads can proceed
+            # Downloads that made progress resume right away
+            await asyncio.sleep(self.backoff * 2 ** (failures - 1) if failures else 0)
+
+
+    def download(self, url, progress=None):
+        """
+        Downloads the given url as fetch() does, blocking.
+        """
+        return asyncio.run(self.fetch(url, progress))
+
+
+    async def fetch_all(self, urls, callback):
+        """
+        Downloads all urls concurrently, passing each one to callback as soon as it completes.
+
+        Params
+        ======
+        urls: []
+            Array of urls to download.
+        callback: function
+            Called as callback(url, content, error) on the event loop's default executor, with error being None on success and content None on failure.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def run(url):
+            content, error = None, None
+
+            try:
+                content = await self.fetch(url)
+
+            except Exception as e:
+                error = e
+
+            await loop.run_in_executor(None, callback, url, content, error)
+
+        await asyncio.gather(*[run(url) for url in urls])
+
+
+    def close(self):
+        """
+        Shuts down the thread pool and session.
+        """
+        self.executor.shutdown()
+        self.session.close()
+
+
+def acquire(lock, stale):
+    """
+    Creates the lock file, unless another download holds it. A lock not touched for stale seconds is taken over, as its download stopped without releasing it.
+
+    Returns
+    =======
+    _: bool
+        Whether the lock was acquired.
+    """
+    for _ in range(2):
+        try:
+            lock.touch(exist_ok=False)
+
+            return True
+
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime < stale:
+                    return False
+
+                lock.unlink()
+
+            # Released in the meantime
+            except FileNotFoundError:
+                pass
+
+    return False
+
+
+def copy(f):
+    """
+    Returns a copy of the file f in a temporary file, both rewound.
+    """
+    c = tempfile.TemporaryFile()
+
+    f.seek(0)
+    shutil.copyfileobj(f, c, CHUNK_SIZE)
+
+    f.seek(0)
+    c.seek(0)
+
+    return c
+
+
+def content_range(r):
+    """
+    Returns the first byte, last byte and total size in the Content-Range header of the response, each None if unknown.
+    """
+    m = re.fullmatch(r"bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)", r.headers.get("Content-Range", "").strip())
+
+    if m is None:
+        return None, None, None
+
+    return tuple(int(x) if x and x != "*" else None for x in m.groups())
+
+
+def verify(f):
+    """
+    Checks the CRC of every member of the zip file f, then rewinds it.
+
+    Raises
+    ======
+    CorruptDownload:
+        If f is not a zip file, or a member fails its CRC check.
+    """
+    try:
+        with ZipFile(f) as zf:
+            bad = zf.testzip()
+
+    except (BadZipFile, EOFError) as e:
+        raise CorruptDownload(f"The download is not a valid zip file: {e}")
+
+    if bad is not None:
+        raise CorruptDownload(f"The member '{bad}' of the downloaded zip file failed its CRC check.")
+
+    f.seek(0)
@@ -3,20 +3,122 @@ from pathlib import Path
 
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 
 import logging
 from selenium.webdriver.remote.remote_connection import LOGGER
 
 import os
+import shutil
+from queue import Queue
+from contextlib import contextmanager
+
+# Resolves with the first element matching the selector as soon as it is added to the page, or with null after the timeout in milliseconds
+WAIT_SCRIPT = """
+const [selector, timeout, done] = arguments;
+const found = document.querySelector(selector);
+
+if (found) {
+    return done(found);
+}
+
+const observer = new MutationObserver(() => {
+    const element = document.querySelector(selector);
+
+    if (element) {
+        observer.disconnect();
+        done(element);
+    }
+});
+
+observer.observe(document, {childList: true, subtree: true, attributes: true, attributeFilter: ["class", "id"]});
+
+setTimeout(() => {
+    observer.disconnect();
+    done(null);
+}, timeout);
+"""
+
+# Firefox preferences of the lean profile, which skips everything the scraper does not need
+LEAN_PREFERENCES = {
+    # Images, web fonts and media
+    "permissions.default.image": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "browser.display.use_document_fonts": 0,
+    "media.autoplay.default": 5,
+    "media.peerconnection.enabled": False,
+
+    # Analytics and other trackers
+    "privacy.trackingprotection.enabled": True,
+    "privacy.trackingprotection.socialtracking.enabled": True,
+
+    # Background features
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "dom.webnotifications.enabled": False,
+    "geo.enabled": False,
+    "toolkit.telemetry.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "app.update.auto": False,
+    "extensions.update.enabled": False,
+}
+
+
+def find_gecko(driver_name=None):
+    """
+    Searches the current directory and its parents for the geckodriver executable, then the PATH.
+
+    Params
+    ======
+    driver_name: str
+        The file name of the geckodriver executable, by default geckodriver.exe on Windows and geckodriver elsewhere.
+
+    Returns
+    =======
+    gecko: Path
+        Path to the geckodriver
+
+    Raises
+    ======
+    Exception:
+        If the geckodriver cannot be found.
+    """
+    driver_name = driver_name or ("geckodriver.exe" if os.name == "nt" else "geckodriver")
+
+    # Start with current directory and move up
+    cd = Path().cwd()
+
+    while True: 
+        gecko = cd / driver_name
+
+        if gecko.exists():
+            return gecko
+
+        if cd == cd.parent: 
+            break
+
+        cd = cd.parent
+
+    # Otherwise, fall back to an installed geckodriver
+    gecko = shutil.which(driver_name)
+
+    if gecko is None:
+        raise Exception(f"{driver_name} not found.")
+
+    return Path(gecko)
+
 
 class Driver():
     """
     A class to handle the webdriver.
     """
-    def __init__(self, gecko=None, link=None):
+    def __init__(self, gecko=None, link=None, lean=True):
         """
         Constructor class. Starts the webdriver from the given executable path 'gecko' and optionally goes to the required link.
 
@@ -28,32 +130,12 @@ class Driver():
             Path to the geckodriver
         link: str
             Optional link to move to
+        lean: bool
+            Whether to use the lean profile, LEAN_PREFERENCES, and return from goto() once the page is interactive rather than fully loaded. Pages then need waiting on the elements used, see wait().
         """
         # Verify geckodriver is available
         if not gecko:
-
-            # Search for driver
-            driver_name = "geckodriver.exe"
-            
-            # Start with current directory and move up
-            cd = Path().cwd()
-
-            while True: 
-                contents = [str(x.name) for x in cd.iterdir()]
-
-                if driver_name not in contents: 
-                    if cd != cd.parent: 
-                        cd = cd.parent 
-
-                    else:
-                        raise Exception("geckodriver.exe not found.")
-
-                else: 
-                    for i in cd.iterdir():
-                        if driver_name == i.name: 
-                            gecko = i 
-
-                    break 
+            gecko = find_gecko()
 
         # Disable logging
         LOGGER.setLevel(logging.WARNING)
@@ -62,8 +144,17 @@ class Driver():
         o = Options()
         o.add_argument("--headless") 
 
+        capabilities = DesiredCapabilities.FIREFOX.copy()
+
+        if lean:
+            for name, value in LEAN_PREFERENCES.items():
+                o.set_preference(name, value)
+
+            # Stop waiting for the page at DOMContentLoaded, instead of after all of its resources
+            capabilities["pageLoadStrategy"] = "eager"
+
         # Start driver
-        self.d = webdriver.Firefox(executable_path=gecko, options=o, service_log_path=os.devnull)
+        self.d = webdriver.Firefox(executable_path=gecko, options=o, desired_capabilities=capabilities, service_log_path=os.devnull)
 
         # Move to link
         if link: 
@@ -89,10 +180,24 @@ class Driver():
         return self.d.page_source
 
     
+    def script(self, js, *args):
+        """
+        Runs the JavaScript in the page.
+
+        Returns
+        =======
+        _: object
+            The value returned by the script.
+        """
+        return self.d.execute_script(js, *args)
+
+
     def wait(self, method, s, wait_time=10):
         """
         Waits via the given method, checking for s, for the given wait time.
 
+        Elements by id and class name are waited on in the page itself, so the wait ends as soon as the element is added. Other methods are polled.
+
         Params
         ======
         method: By
@@ -106,8 +211,46 @@ class Driver():
         =======
         _: WebElement
             The WebElement we wait for
+
+        Raises
+        ======
+        TimeoutException:
+            If the element is not found in time.
+        """
+        selector = {By.ID: f'[id="{s}"]', By.CLASS_NAME: f'[class~="{s}"]'}.get(method)
+
+        if selector is None:
+            return WebDriverWait(self.d, wait_time, poll_frequency=0.05).until(EC.presence_of_element_located((method, s)))
+
+        self.d.set_script_timeout(wait_time + 5)
+
+        element = self.d.execute_async_script(WAIT_SCRIPT, selector, wait_time * 1000)
+
+        if element is None:
+            raise TimeoutException(f"'{s}' was not found within {wait_time} s.")
+
+        return element
+
+
+    def alive(self):
+        """
+        Returns whether the browser still responds.
         """
-        return WebDriverWait(self.d, wait_time).until(EC.presence_of_element_located((method, s)))
+        try: 
+            self.d.current_url
+
+        except Exception:
+            return False
+
+        return True
+
+
+    def reset(self):
+        """
+        Clears the cookies of the current website and leaves the page, so that the next user of the driver starts afresh.
+        """
+        self.d.delete_all_cookies()
+        self.d.get("about:blank")
 
 
     def close(self):
@@ -117,6 +260,13 @@ class Driver():
         self.d.close()
 
 
+    def quit(self):
+        """
+        Quits the driver, shutting down the browser and geckodriver.
+        """
+        self.d.quit()
+
+
 def by(s): 
     """
     Returns By constants for the driver.
@@ -127,4 +277,103 @@ def by(s):
         return By.ID
 
     elif s == "class_name":
-        return By.CLASS_NAME
\ No newline at end of file
+        return By.CLASS_NAME
+
+
+# === Driver pool ===
+class DriverPool():
+    """
+    A bounded pool of Driver instances to be shared between threads. 
+
+    Drivers are started lazily, and each one is recycled after it has served a given number of pages to keep the browser's memory in check.
+    """
+    def __init__(self, size=2, recycle=20, gecko=None, lean=True):
+        """
+        Constructor class. Creates 'size' empty driver slots.
+
+        Params
+        ======
+        size: int
+            The maximum number of drivers running at the same time.
+        recycle: int
+            The number of pages a driver serves before it is restarted.
+        gecko: str
+            Path to the geckodriver. The parent folders are searched when the first driver starts if it is None.
+        lean: bool
+            Whether the drivers use the lean profile, see Driver.
+        """
+        self.size = size
+        self.recycle = recycle
+        self.gecko = gecko
+        self.lean = lean
+
+        # Each slot holds None (no driver started yet) or a [driver, pages served] pair
+        self.slots = Queue()
+
+        for _ in range(size):
+            self.slots.put(None)
+
+
+    @contextmanager
+    def driver(self):
+        """
+        Borrows a driver from the pool, blocking until one is free. 
+
+        If an exception is raised while the driver is borrowed, the driver is discarded, as the page it is on is in an unknown state.
+
+        Yields
+        ======
+        _: Driver
+            The borrowed driver
+        """
+        slot = self.slots.get()
+
+        try: 
+            # Replace crashed browsers
+            if slot is not None and not slot[0].alive():
+                self._discard(slot)
+                slot = None
+
+            if slot is None:
+                self.gecko = self.gecko or find_gecko()
+                slot = [Driver(self.gecko, lean=self.lean), 0]
+
+            yield slot[0]
+
+            slot[1] += 1
+
+            # Restart the driver once it has served enough pages
+            if slot[1] >= self.recycle:
+                self._discard(slot)
+                slot = None
+
+        except BaseException:
+            self._discard(slot)
+            slot = None
+
+            raise
+
+        finally:
+            self.slots.put(slot)
+
+
+    def close(self):
+        """
+        Quits all drivers in the pool.
+        """
+        for _ in range(self.size):
+            self._discard(self.slots.get())
+
+
+    def _discard(self, slot):
+        """
+        Quits the driver in the given slot, ignoring any errors from an already crashed browser.
+        """
+        if slot is None:
+            return
+
+        try: 
+            slot[0].quit()
+
+        except Exception:
+            pass
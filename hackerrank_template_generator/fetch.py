@@ -0,0 +1,132 @@
+# === HTTP Fetcher Class ===
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from challenge import split_code
+
+# HackerRank's template keys for each language name in configs.json
+LANGUAGE_KEYS = {
+    "Python 3": "python3",
+    "Python 2": "python",
+    "C": "c",
+    "C++": "cpp",
+    "C++14": "cpp14",
+    "C++20": "cpp20",
+    "Java 7": "java",
+    "Java 8": "java8",
+    "Java 15": "java15",
+}
+
+
+class Fetcher():
+    """
+    A class to fetch challenges over plain HTTP from HackerRank's REST API, without a browser.
+    """
+    def __init__(self, website_link, lang, pool_size=10, timeout=10):
+        """
+        Constructor class. Sets up a pooled session.
+
+        Params
+        ======
+        website_link: str
+            The website to fetch from. This can point to a local stand-in server, see mock_server.py.
+        lang: str
+            The programming language, as named in configs.json.
+        pool_size: int
+            The number of connections kept alive, which should be at least the number of threads sharing the fetcher.
+        timeout: int
+            The time in seconds to wait for each response.
+        """
+        assert lang in LANGUAGE_KEYS, f"The language '{lang}' is not supported over HTTP."
+
+        self.website_link = website_link.rstrip("/")
+        self.lang_key = LANGUAGE_KEYS[lang]
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Mozilla'})
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+
+    def urls(self, link):
+        """
+        Returns the REST API links of the challenge at the given link.
+
+        Returns
+        =======
+        challenge_url: str
+            The link to the challenge's JSON model
+        samples_url: str
+            The link to the sample test case zip file
+        """
+        # The link is of the form .../contests/<contest>/challenges/<slug>/... or .../challenges/<slug>/...
+        parts = [x for x in urlparse(link).path.split("/") if x]
+
+        assert "challenges" in parts[:-1], f"'{link}' is not a link to a challenge."
+
+        slug = parts[parts.index("challenges") + 1]
+        contest = parts[parts.index("contests") + 1] if "contests" in parts else "master"
+
+        challenge_url = f"{self.website_link}/rest/contests/{contest}/challenges/{slug}"
+
+        return challenge_url, f"{challenge_url}/download_testcases"
+
+
+    def get(self, url):
+        """
+        Returns the response from the given url, raising for any HTTP error.
+        """
+        r = self.session.get(url, timeout=self.timeout)
+        r.raise_for_status()
+
+        return r
+
+
+    def challenge(self, link, p):
+        """
+        Fetches the challenge at the given link.
+
+        Params
+        ======
+        link: str
+            The link to the challenge.
+        p: Parser
+            The string parser.
+
+        Returns
+        =======
+        challenge: dict
+            The challenge information, in the same form as returned by download.scrape().
+
+        Raises
+        ======
+        AssertionError:
+            If the challenge has no template in the desired language.
+        """
+        challenge_url, samples_url = self.urls(link)
+
+        page = self.get(challenge_url)
+        model = page.json()["model"]
+
+        # The template may be split into a head and tail around the editable part
+        template = [model.get(f"{self.lang_key}{x}") for x in ["_template_head", "_template", "_template_tail"]]
+        template = "\n".join(t for t in template if t)
+
+        assert template, f"The challenge has no {self.lang_key} template."
+
+        imports, function, main = split_code(template.split("\n"), p)
+
+        return {
+            "title": model["name"],
+            "difficulty": model["difficulty_name"],
+            "imports": imports,
+            "function": function,
+            "main": main,
+            "samples_link": samples_url,
+            "page": page.text
+        }
@@ -20,76 +20,101 @@ def main(args):
 
 
 # === Debug ===
+import sys
+
 def DEBUG(*args, **kwargs):
     """
     If this function is not run directly, i.e. it is under test, this will take on the print statement. Otherwise, nothing happens. 
+    It prints to stderr, as stdout is captured as part of the answers under test.
     """
     if __name__ != "__main__":
-        print(*args, **kwargs)
+        print(*args, file=sys.stderr, **kwargs)
 
 
 # === Mock ===
+import io
+import tempfile
+
+# The number of characters above which the answers are spilled from memory to a temporary file
+SPILL_SIZE = 16 * 1024 * 1024
+
 # Mock fptr.write()
 class Writer():
     def __init__(self):
-        """Initialises the list of answers."""
-        self.answers = []
+        """Initialises the buffer of answers."""
+        self.answers = io.StringIO()
+        self.size = 0
 
 
     def write(self, string):
-        """Appends the string to a list, which is then accessed by the parent test function to check for equality of arguments.
+        """Writes the string to the buffer of answers, which is then read by the parent test function to check for equality of arguments.
+        The buffer is spilled to a temporary file once it holds more than SPILL_SIZE characters.
         
         Params
         ======
         string: str
-            The string to be appended to the list of answers.
+            The string to be written to the answers.
         """
-        # Process the string to be appended, to remove the final newline character as added in main()
-        li = string.rsplit('\n', 1)
+        self.answers.write(string)
+        self.size += len(string)
 
-        self.answers.append(''.join(li))
+        if self.size > SPILL_SIZE and isinstance(self.answers, io.StringIO):
+            spilled = tempfile.TemporaryFile("w+", encoding="utf-8")
+            spilled.write(self.answers.getvalue())
+
+            self.answers = spilled
 
     
     def get_answers(self): 
         """
-        Returns the answers and resets it.
+        Returns the answers and resets them.
 
         Returns
         =======
-        result: list of strings
-            The answers to be returned.
+        result: file
+            The answers, as a text stream rewound to the start.
         """
         result = self.answers 
+        result.seek(0)
 
-        self.answers = []
+        self.__init__()
 
         return result
 
 
+    def flush(self):
+        pass
+
+
     def close(self):
         pass
 
 
 fptr = Writer()
 
-# List of inputs
-list_of_inputs = []
+# Stream of inputs, shared by input() and sys.stdin
+stdin = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", newline="\n")
 
 # Sets inputs
 def set_inputs(string):
     """
-    This function sets the inputs to be mocked by the input() function. 
-    The #string# passed is split by the newline character. Each element then makes up the argument called sequentially by input().
+    This function sets the inputs to be mocked by the input() function and sys.stdin. 
+    The #string# passed is split by the newline character. Each element then makes up the argument called sequentially by input(), and solutions reading sys.stdin directly continue from where input() left off.
     """
-    global list_of_inputs
+    global stdin
 
-    list_of_inputs = string.split("\n")
+    stdin = io.TextIOWrapper(io.BytesIO(f"{string}\n".encode("utf-8")), encoding="utf-8", newline="\n")
 
 
 # Mocks the inputs
-def input():
+def input(prompt=None):
     """
-    Mocks the 'input()' function. 
-    If arguments is not None, it resets the arguments used. 
+    Mocks the 'input()' function, returning the next line set by set_inputs() from the shared stream.
+    Like the built-in, EOFError is raised once there are no lines left.
     """
-    return list_of_inputs.pop(0)
\ No newline at end of file
+    line = stdin.readline()
+
+    if line:
+        return line.rstrip("\n")
+
+    raise EOFError("EOF when reading a line")
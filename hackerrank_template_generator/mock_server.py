@@ -0,0 +1,272 @@
+# === Mock Server ===
+"""
+A local stand-in for HackerRank that serves recorded responses, so the HTTP fetch path can be run without the network.
+
+Record the responses of a challenge with
+    python mock_server.py record "link" recordings
+and serve them with
+    python mock_server.py serve recordings --port 8000
+before pointing download.py at it with --website http://localhost:8000. Recording a challenge replays it through a Fetcher against the recordings, so a recording that cannot be served is caught at once. The replay can be repeated with
+    python mock_server.py check "link" recordings
+
+Each response is saved under its url path with a .body suffix, since the path of a challenge, .../challenges/<slug>, is also the parent of the path of its sample test cases, .../challenges/<slug>/download_testcases.
+
+Files are served with HTTP Range support. To exercise resumed downloads, pass --drop-after BYTES --drops N to cut the first N responses after BYTES bytes of their body.
+"""
+from pathlib import Path
+import os
+import re
+import json
+import threading
+
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from functools import partial
+from urllib.parse import urlparse, unquote
+
+from argparse import ArgumentParser
+
+from fetch import Fetcher
+from char_parser import Parser
+
+# Suffix of the files recorded responses are saved in
+BODY_SUFFIX = ".body"
+
+
+def body_path(directory, url_path):
+    """
+    Returns the file the response to the given url path is recorded in, within directory.
+    """
+    # Like SimpleHTTPRequestHandler, never leave directory
+    parts = [x for x in unquote(urlparse(url_path).path).split("/") if x not in ["", ".", ".."]]
+
+    return Path(directory, *parts[:-1], f"{parts[-1] if parts else ''}{BODY_SUFFIX}")
+
+
+def record(link, dest, website_link, lang):
+    """
+    Saves the REST API responses of the challenge at the given link into dest, each into the file of its url path, then checks that they replay.
+    """
+    fetcher = Fetcher(website_link, lang)
+
+    for url in fetcher.urls(link):
+        path = body_path(dest, url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with path.open("wb") as fw:
+            fw.write(fetcher.get(url).content)
+
+        print(f"Recorded {url}")
+
+    check(link, dest, lang)
+
+
+def check(link, directory, lang):
+    """
+    Serves the recordings in directory on a free port and fetches the challenge at the given link from them through a Fetcher, as download.py would with --website.
+
+    Raises
+    ======
+    AssertionError:
+        If a response is missing from the recordings or differs from its recording.
+    """
+    with server(directory, 0) as s:
+        threading.Thread(target=s.serve_forever, daemon=True).start()
+
+        try:
+            fetcher = Fetcher(f"http://localhost:{s.server_address[1]}", lang)
+            challenge = fetcher.challenge(link, Parser())
+
+            for url in fetcher.urls(link):
+                assert fetcher.get(url).content == body_path(directory, url).read_bytes(), f"The response of {url} differs from its recording."
+
+        finally:
+            s.shutdown()
+
+    print(f"Replayed '{challenge['title']}' from {directory}")
+
+
+# === Server ===
+class RangeHandler(SimpleHTTPRequestHandler):
+    """
+    Serves files with support for single HTTP Range requests, honouring If-Range against their Last-Modified date, and cuts responses short while the server has disconnects left to inject.
+
+    A url path is served from its recorded response if there is one, see body_path(), or else from the file at that path.
+    """
+    def translate_path(self, path):
+        recorded = body_path(self.directory, path)
+
+        if recorded.is_file():
+            return str(recorded)
+
+        return super().translate_path(path)
+
+
+    def send_head(self):
+        # The [first, last] bytes of the file being served, or None for all of it
+        self.range = None
+
+        path = self.translate_path(self.path)
+        header = self.headers.get("Range")
+
+        if header is None or not os.path.isfile(path):
+            return super().send_head()
+
+        f = open(path, "rb")
+        stat = os.fstat(f.fileno())
+        last_modified = self.date_time_string(stat.st_mtime)
+
+        m = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+
+        # Unsupported ranges, and ranges of a file that changed since, get the whole file
+        if m is None or not any(m.groups()) or self.headers.get("If-Range", last_modified) != last_modified:
+            f.close()
+
+            return super().send_head()
+
+        first, last = m.groups()
+
+        if first:
+            first, last = int(first), min(int(last or stat.st_size - 1), stat.st_size - 1)
+
+        # Suffix ranges are the last bytes of the file
+        else:
+            first, last = max(0, stat.st_size - int(last)), stat.st_size - 1
+
+        if first >= stat.st_size or first > last:
+            f.close()
+
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{stat.st_size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+            return None
+
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header("Content-type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {first}-{last}/{stat.st_size}")
+        self.send_header("Content-Length", str(last - first + 1))
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+
+        f.seek(first)
+        self.range = (first, last)
+
+        return f
+
+
+    def copyfile(self, source, outputfile):
+        remaining = self.range[1] - self.range[0] + 1 if self.range else None
+        cut = self.server.take_disconnect()
+
+        while remaining is None or remaining > 0:
+            size = 64 * 1024 if remaining is None else min(64 * 1024, remaining)
+
+            if cut is not None:
+                size = min(size, cut)
+
+            chunk = source.read(size)
+
+            if not chunk:
+                break
+
+            outputfile.write(chunk)
+
+            if remaining is not None:
+                remaining -= len(chunk)
+
+            if cut is not None:
+                cut -= len(chunk)
+
+                # Drop the connection in the middle of the body
+                if cut == 0:
+                    self.close_connection = True
+
+                    return
+
+
+class MockServer(ThreadingHTTPServer):
+    """
+    A threading HTTP server that injects a number of disconnects into the responses of its RangeHandler.
+    """
+    def __init__(self, address, handler, drop_after=None, drops=0):
+        """
+        Params
+        ======
+        drop_after: int
+            The number of bytes of the body after which a response is cut, or None to never cut responses.
+        drops: int
+            The number of responses cut, after which responses are served whole.
+        """
+        super().__init__(address, handler)
+
+        self.drop_after = drop_after
+        self.drops = drops
+        self.lock = threading.Lock()
+
+
+    def take_disconnect(self):
+        """
+        Returns the number of body bytes after which to cut the current response, or None to serve it whole.
+        """
+        with self.lock:
+            if self.drop_after is None or self.drops <= 0:
+                return None
+
+            self.drops -= 1
+
+            return self.drop_after
+
+
+def server(directory, port=8000, drop_after=None, drops=0):
+    """
+    Returns a server for the recorded responses in directory, to be started with serve_forever(). Port 0 picks a free port. The first drops responses are cut after drop_after bytes of their body.
+    """
+    handler = partial(RangeHandler, directory=str(directory))
+
+    return MockServer(("localhost", port), handler, drop_after, drops)
+
+
+def serve(directory, port=8000, drop_after=None, drops=0):
+    """
+    Serves the recorded responses in directory until interrupted.
+    """
+    with server(directory, port, drop_after, drops) as s:
+        print(f"Serving {directory} on http://localhost:{port}")
+
+        s.serve_forever()
+
+
+# === Script ===
+if __name__ == "__main__":
+    with (Path().cwd() / "configs.json").open("r") as fr:
+        configs = json.load(fr)
+
+    ap = ArgumentParser(description="Records and serves HackerRank responses locally.")
+    sp = ap.add_subparsers(dest="command", required=True)
+
+    rp = sp.add_parser("record", help="Record the responses of a challenge.")
+    rp.add_argument("link")
+    rp.add_argument("dest")
+
+    cp = sp.add_parser("check", help="Replay recorded responses of a challenge through a Fetcher.")
+    cp.add_argument("link")
+    cp.add_argument("directory")
+
+    sv = sp.add_parser("serve", help="Serve recorded responses.")
+    sv.add_argument("directory")
+    sv.add_argument("--port", type=int, default=8000)
+    sv.add_argument("--drop-after", type=int, help="Cut responses after this many bytes of their body.")
+    sv.add_argument("--drops", type=int, default=0, help="Number of responses cut.")
+
+    args = ap.parse_args()
+
+    if args.command == "record":
+        record(args.link, args.dest, configs["website_link"], configs["language"])
+
+    elif args.command == "check":
+        check(args.link, args.directory, configs["language"])
+
+    else:
+        serve(args.directory, args.port, args.drop_after, args.drops)
@@ -0,0 +1,114 @@
+# === Page Class ===
+from functools import cached_property
+
+from bs4 import SoupStrainer
+
+from soup import soup
+from challenge import editor_lines, EDITOR_CLASS
+
+# Elements of the challenge page
+TITLE_CLASS = "text-headline"
+DIFF_BLOCK_CLASS = [
+    "sidebar-problem-difficulty",
+    "challenge-sidebar-help"
+]
+DIFF_BLOCK_LEVEL_CLASS = "pull-right"
+SAMPLES_DOWNLOAD_ID = "test-cases-link"
+LANG_BOX_CLASS = "css-1hwfws3"
+LANG_LIST_ELEMENT_CLASS = "css-m62ux7"
+
+# Classes of the elements read from the page, which are built into the tree with their contents, see Page
+READ_CLASSES = {TITLE_CLASS, *DIFF_BLOCK_CLASS, LANG_BOX_CLASS, LANG_LIST_ELEMENT_CLASS, EDITOR_CLASS}
+
+
+def read_class(value):
+    """
+    Returns whether the class attribute value, None if the element has none, holds one of READ_CLASSES.
+    """
+    if value is None:
+        return False
+
+    return not READ_CLASSES.isdisjoint(value.split() if isinstance(value, str) else value)
+
+
+class Page():
+    """
+    A snapshot of a challenge page, parsed once. Each piece of challenge information is extracted on first use, then kept. Take a new snapshot after the page changes, e.g. after changing the language.
+
+    Only the elements of READ_CLASSES are built into the tree, rather than the whole page with its problem statement. The samples link, which has an id rather than a class, is parsed for separately.
+    """
+    def __init__(self, source, parser=None, strain=True):
+        """
+        Constructor class.
+
+        Params
+        ======
+        source: str
+            The page source HTML.
+        parser: str
+            The BeautifulSoup parser backend, by default the fastest installed.
+        strain: bool
+            Whether only the elements read are built into the tree.
+        """
+        self.source = source
+        self.parser = parser
+        self.strain = strain
+        self.bs = soup(source, parser, SoupStrainer(attrs={"class": read_class}) if strain else None)
+
+
+    @cached_property
+    def title(self):
+        """
+        The challenge title.
+        """
+        return self.bs.find("div", {"class": TITLE_CLASS}).getText()
+
+
+    @cached_property
+    def difficulty(self):
+        """
+        The difficulty level.
+        """
+        diff_block = self.bs.find("div", {"class": DIFF_BLOCK_CLASS})
+        diff_block = list(filter(lambda x: "Difficulty" in x.getText(), diff_block))[0].find("p", {"class": DIFF_BLOCK_LEVEL_CLASS})
+
+        return diff_block.getText()
+
+
+    @cached_property
+    def samples_link(self):
+        """
+        The path of the sample test case zip file, relative to the website.
+        """
+        bs = soup(self.source, self.parser, SoupStrainer("a", id=SAMPLES_DOWNLOAD_ID)) if self.strain else self.bs
+        samples_link = bs.find("a", id=SAMPLES_DOWNLOAD_ID)
+
+        assert samples_link.attrs["href"]
+
+        return samples_link.attrs["href"]
+
+
+    @cached_property
+    def language(self):
+        """
+        The selected programming language.
+        """
+        return self.bs.find("div", {"class": LANG_BOX_CLASS}).getText()
+
+
+    @cached_property
+    def languages(self):
+        """
+        Dictionary of each programming language in the open language list to the id of its element.
+        """
+        languages = self.bs.find("div", {"class": LANG_LIST_ELEMENT_CLASS}).findChildren()
+
+        return {l.getText(): l.attrs["id"] for l in languages if "id" in l.attrs}
+
+
+    @cached_property
+    def editor(self):
+        """
+        Array of the lines of the online code rendered by the editor, see challenge.editor_lines().
+        """
+        return editor_lines(self.bs)
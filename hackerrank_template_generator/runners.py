@@ -0,0 +1,382 @@
+# === Runners ===
+"""
+Runner backends for solutions in compiled languages, so that C, C++ and Java solutions are tested on the same cases as functions.py.
+
+Write the solution as HackerRank runs it, reading stdin and writing stdout, into the source file of its language, e.g. solution.cpp for C++ or Solution.java for Java, then set LANGUAGE in test_functions.py or "language" in configs.json. The solution is compiled once with the local toolchain, and the build is cached in .build/ by the hash of the source and the compiler flags, so an unchanged solution is never rebuilt.
+"""
+from pathlib import Path
+import os
+import io
+import sys
+import math
+import json
+import time
+import signal
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+
+import test_functions as tf
+
+# Folder of the workspace that builds are cached in
+BUILD_DIR = ".build"
+
+# Number of builds kept in the build cache, most recently used first
+BUILD_CACHE_SIZE = 20
+
+# Number of characters of the standard error of a failed solution shown with its error
+STDERR_TAIL = 500
+
+
+# === Backend Class ===
+class Backend():
+    """
+    How to compile and run solutions in a language.
+
+    Commands are templates, in which {src} is the source file, {out} the build folder, and {memory} the memory limit in megabytes.
+    """
+    def __init__(self, source, compile, run, flags, limit_address_space=True):
+        """
+        Constructor class.
+
+        Params
+        ======
+        source: str
+            The name of the source file of the solution in the workspace.
+        compile: []
+            The compile command, with the flags inserted after its first word.
+        run: []
+            The command running the compiled solution.
+        flags: []
+            The default compiler flags.
+        limit_address_space: bool
+            Whether the memory limit is enforced on the address space of the process. Virtual machines reserving more address space than they use, i.e. the JVM, limit their heap with their own options instead.
+        """
+        self.source = source
+        self.compile = compile
+        self.run = run
+        self.flags = flags
+        self.limit_address_space = limit_address_space
+
+
+# Backends of the languages in configs.json, by name
+BACKENDS = {
+    "C": Backend("solution.c", ["gcc", "{src}", "-o", "{out}/solution", "-lm"], ["{out}/solution"], ["-O2", "-std=c11"]),
+    "C++": Backend("solution.cpp", ["g++", "{src}", "-o", "{out}/solution"], ["{out}/solution"], ["-O2", "-std=c++17"]),
+    "C++14": Backend("solution.cpp", ["g++", "{src}", "-o", "{out}/solution"], ["{out}/solution"], ["-O2", "-std=c++14"]),
+    "C++20": Backend("solution.cpp", ["g++", "{src}", "-o", "{out}/solution"], ["{out}/solution"], ["-O2", "-std=c++20"]),
+    "Java 8": Backend("Solution.java", ["javac", "-d", "{out}", "{src}"], ["java", "-Xmx{memory}m", "-Xss64m", "-cp", "{out}", "Solution"], ["-encoding", "UTF-8"], limit_address_space=False),
+    "Java 15": Backend("Solution.java", ["javac", "-d", "{out}", "{src}"], ["java", "-Xmx{memory}m", "-Xss64m", "-cp", "{out}", "Solution"], ["-encoding", "UTF-8"], limit_address_space=False)
+}
+
+# Standard error of solutions that ran out of memory
+MEMORY_ERRORS = ["std::bad_alloc", "java.lang.OutOfMemoryError"]
+
+# Runs the command in its remaining arguments in a child process, under the CPU time limit in seconds and, unless 0, the address space limit in bytes given as its second and third arguments. The exit code, CPU time and peak resident memory of the child are then written, separated by spaces, to the file descriptor given as its first argument.
+# Limits are applied in this launcher, rather than between fork and exec in the test process, which is unsafe while cases run in threads. As a process starts with the resident memory of its parent, the solution is forked from the small launcher rather than from the test process, so that its peak is its own
+LAUNCHER = """
+import os, sys, resource
+report, cpu, memory = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3])
+pid = os.fork()
+if pid == 0:
+    try:
+        os.close(report)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+        if memory:
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        os.execvp(sys.argv[4], sys.argv[4:])
+    except BaseException as e:
+        os.write(2, f"{e}\\n".encode())
+    finally:
+        os._exit(127)
+_, status, usage = os.wait4(pid, 0)
+os.write(report, f"{os.waitstatus_to_exitcode(status)} {usage.ru_utime + usage.ru_stime} {usage.ru_maxrss}".encode())
+"""
+
+
+class CompilationError(Exception):
+    """
+    The solution failed to compile.
+    """
+
+
+# === Runner Class ===
+class Runner():
+    """
+    Compiles a solution in a compiled language and runs it on case inputs through stdin and stdout pipes.
+    """
+    def __init__(self, language, source=None, flags=None, build_dir=BUILD_DIR):
+        """
+        Constructor class.
+
+        Params
+        ======
+        language: str
+            The language of the solution, as named in configs.json.
+        source: str
+            The path of the source file, by default the source file of the language in the workspace.
+        flags: []
+            The compiler flags, by default those of the language.
+        build_dir: str
+            The folder that builds are cached in.
+        """
+        assert language in BACKENDS, f"There is no runner for the language '{language}'."
+
+        self.language = language
+        self.backend = BACKENDS[language]
+        self.source = Path(source or Path(tf.__file__).parent / self.backend.source)
+        self.flags = self.backend.flags if flags is None else flags
+        self.build_dir = Path(build_dir)
+
+        self.out = None
+
+
+    def command(self):
+        """
+        Returns the compile command of the solution, with {out} left to be filled in.
+        """
+        compiler, *args = self.backend.compile
+
+        return [compiler, *self.flags, *[a.replace("{src}", str(self.source)) for a in args]]
+
+
+    def key(self):
+        """
+        Returns the hash of the build, from the source, the compile command, and the compiler, so that upgrading the toolchain rebuilds the solution too.
+
+        Raises
+        ======
+        CompilationError:
+            If the source file or the compiler does not exist.
+        """
+        if not self.source.exists():
+            raise CompilationError(f"The solution '{self.source.name}' does not exist.")
+
+        compiler = shutil.which(self.backend.compile[0])
+
+        if compiler is None:
+            raise CompilationError(f"The compiler '{self.backend.compile[0]}' of {self.language} was not found.")
+
+        stat = Path(compiler).resolve().stat()
+
+        digest = hashlib.sha256(self.source.read_bytes())
+        digest.update(json.dumps([self.command(), compiler, stat.st_size, stat.st_mtime_ns]).encode("utf-8"))
+
+        return digest.hexdigest()
+
+
+    def build(self):
+        """
+        Compiles the solution, unless its build is cached.
+
+        Returns
+        =======
+        out: Path
+            The build folder.
+
+        Raises
+        ======
+        CompilationError:
+            If the solution fails to compile, with the errors of the compiler.
+        """
+        out = self.build_dir / self.key()
+
+        if out.exists():
+            # Keep recently used builds in the cache
+            os.utime(out)
+
+        else:
+            self.build_dir.mkdir(exist_ok=True)
+
+            # Build in a temporary folder, so an interrupted build is never cached
+            tmp = Path(tempfile.mkdtemp(dir=self.build_dir, prefix=".tmp"))
+
+            try:
+                command = [a.replace("{out}", str(tmp)) for a in self.command()]
+                p = subprocess.run(command, stdin=subprocess.DEVNULL, capture_output=True, text=True)
+
+                if p.returncode != 0:
+                    raise CompilationError(f"{self.source.name} failed to compile:\n{p.stderr.strip()}")
+
+                os.replace(tmp, out)
+
+            except BaseException:
+                shutil.rmtree(tmp, ignore_errors=True)
+
+                raise
+
+            prune(self.build_dir)
+
+        self.out = out
+
+        return out
+
+
+    def execute(self, inputs, time_limit=None, memory_limit=None):
+        """
+        Runs the compiled solution on the inputs, under hard CPU time and memory limits where available, measuring its performance. build() must be called first.
+
+        Params
+        ======
+        inputs: str
+            The inputs, written to the standard input of the solution.
+        time_limit: float
+            The time limit in seconds, by default tf.TIME_LIMIT. Solutions are also killed after twice the time limit of wall time.
+        memory_limit: int
+            The memory limit in megabytes, by default tf.MEMORY_LIMIT.
+
+        Returns
+        =======
+        result: {}
+            The result, as returned by tf.execute(), with "memory" the peak resident memory of the solution process. A process starts with the resident memory of the process it is forked from, here the launcher, so it is never below a few megabytes. Without the resource module, i.e. on Windows, "cpu" and "memory" are None.
+        answers: file
+            The standard output of the solution, as a text stream.
+        """
+        assert self.out is not None, "The solution must be built before it is run."
+
+        time_limit = time_limit or tf.TIME_LIMIT
+        memory_limit = memory_limit or tf.MEMORY_LIMIT
+        wall_limit = time_limit * 2
+
+        result = {"error": None, "wall": None, "cpu": None, "memory": None}
+
+        command = [a.replace("{out}", str(self.out)).replace("{memory}", str(memory_limit)) for a in self.backend.run]
+
+        # Hard limits and measures need the resource module, i.e. not Windows
+        launched = tf.resource is not None
+        options = {}
+
+        if launched:
+            report, report_w = os.pipe()
+
+            memory = memory_limit * 1024 * 1024 if self.backend.limit_address_space else 0
+            command = [sys.executable, "-I", "-S", "-c", LAUNCHER, str(report_w), str(math.ceil(time_limit)), str(memory), *command]
+
+            # The launcher and the solution are killed together, as a process group
+            options = {"pass_fds": (report_w,), "start_new_session": True}
+
+        # Standard error is only read if the solution fails
+        with tempfile.TemporaryFile() as stderr:
+            wall = time.perf_counter()
+
+            try:
+                p = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr, **options)
+
+            finally:
+                if launched:
+                    os.close(report_w)
+
+            # Kill the solution once it runs out of wall time
+            timer = threading.Timer(wall_limit, kill, args=(p, launched))
+            timer.start()
+
+            # Feed the inputs from another thread, so that a solution writing before reading all its inputs cannot deadlock
+            feeder = threading.Thread(target=feed, args=(p.stdin, f"{inputs}\n".encode("utf-8")))
+            feeder.start()
+
+            try:
+                answers = p.stdout.read()
+
+            finally:
+                p.stdout.close()
+
+                exitcode = wait(p, wall_limit, launched)
+
+                result["wall"] = time.perf_counter() - wall
+
+                timer.cancel()
+                feeder.join()
+
+            # The launcher reports on the solution, unless it was killed
+            if launched:
+                with os.fdopen(report, "rb") as fr:
+                    measures = fr.read()
+
+                if measures:
+                    exitcode, cpu, memory = measures.split()
+                    exitcode, result["cpu"], memory = int(exitcode), float(cpu), int(memory)
+
+                    # Linux reports kilobytes, macOS bytes
+                    result["memory"] = memory * (1 if sys.platform == "darwin" else 1024)
+
+            stderr.seek(0)
+            errors = stderr.read().decode("utf-8", "replace").strip()[-STDERR_TAIL:]
+
+        if exitcode != 0:
+            if result["wall"] >= wall_limit:
+                result["error"] = tf.TimeLimitExceeded(f"Exceeded the wall time limit of {wall_limit} s.")
+
+            elif any(e in errors for e in MEMORY_ERRORS):
+                result["error"] = tf.MemoryLimitExceeded(f"Exceeded the memory limit of {memory_limit} MB.\n{errors}")
+
+            else:
+                result["error"] = tf.killed(exitcode, time_limit, memory_limit)
+
+                if errors:
+                    result["error"] = type(result["error"])(f"{result['error']}\n{errors}")
+
+        return result, io.StringIO(answers.decode("utf-8", "replace"))
+
+
+def feed(stdin, data):
+    """
+    Writes data to the standard input of a process and closes it, ignoring a process that exits before reading it all.
+    """
+    try:
+        stdin.write(data)
+
+    except (BrokenPipeError, OSError):
+        pass
+
+    finally:
+        try:
+            stdin.close()
+
+        except OSError:
+            pass
+
+
+def kill(p, group=False):
+    """
+    Kills the process p, with its process group if group, ignoring a process that already exited.
+    """
+    try:
+        if group:
+            os.killpg(p.pid, signal.SIGKILL)
+
+        else:
+            p.kill()
+
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def wait(p, timeout=None, group=False):
+    """
+    Waits for the process p to exit, killing it, with its process group if group, after the timeout in seconds.
+
+    Returns
+    =======
+    exitcode: int
+        The exit code of the process, negative if it was killed by a signal.
+    """
+    try:
+        return p.wait(timeout)
+
+    except subprocess.TimeoutExpired:
+        kill(p, group)
+
+        return p.wait()
+
+
+def prune(build_dir, size=BUILD_CACHE_SIZE):
+    """
+    Removes all but the most recently used builds from the build cache.
+    """
+    builds = sorted((b for b in build_dir.iterdir() if not b.name.startswith(".")), key=lambda b: b.stat().st_mtime, reverse=True)
+
+    for b in builds[size:]:
+        shutil.rmtree(b, ignore_errors=True)
+
@@ -1,8 +1,20 @@
 # === Soup Wrapper ===
 from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
 
-def soup(s, parser="lxml"):
+# Parser backends of BeautifulSoup, fastest first. lxml was already the only backend used; html.parser is only a fallback for where lxml is not installed, so the speedup of parsing pages comes from the SoupStrainers of page.py rather than from the backend
+PARSERS = ["lxml", "html.parser"]
+
+
+def fastest_parser():
+    """
+    Returns the first of PARSERS that is installed, i.e. lxml unless it is missing.
+    """
+    return next(p for p in PARSERS if builder_registry.lookup(p))
+
+
+def soup(s, parser=None, parse_only=None):
     """
-    A wrapper function to handle BeautifulSoup defaults.
+    A wrapper function to handle BeautifulSoup defaults. The parser backend is lxml, or html.parser where lxml is not installed, unless given. Only the elements matched by the SoupStrainer parse_only, if given, are built into the tree.
     """
-    return BeautifulSoup(s, parser)
\ No newline at end of file
+    return BeautifulSoup(s, parser or fastest_parser(), parse_only=parse_only)
@@ -0,0 +1,293 @@
+# === Case Object Store ===
+"""
+A shared store of case files, keyed by the SHA-256 of their contents, so that the same case is stored once across all workspaces.
+
+Case files of a workspace are replaced by hardlinks to their objects. Where hardlinks are not possible, e.g. across file systems, the case files are removed and listed instead in a manifest, .objects.json, in their case folder, which test_functions.get_cases() reads through. Objects are read-only, as editing one in place would edit it in every workspace.
+
+Objects that no workspace references any more are removed with
+    python store.py gc
+and the cases of existing workspaces are moved into the store with
+    python store.py add ../../easy/*/test_cases
+"""
+from pathlib import Path
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+
+from argparse import ArgumentParser
+
+# Name of the manifest of the cases of a case folder that are kept in the store, as read by test_functions.py
+OBJECTS_NAME = ".objects.json"
+
+# Name of the list of manifests in the store, which reference its objects besides hardlinks
+MANIFESTS_NAME = "manifests.txt"
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """
+    Returns the SHA-256 of the contents of the file at path, read in chunks.
+    """
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as fr:
+        for chunk in iter(lambda: fr.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+# === ObjectStore Class ===
+class ObjectStore():
+    """
+    A content-addressed store of case files. Objects are kept at objects/<first 2 hex digits>/<remaining hex digits> of their hash.
+    """
+    def __init__(self, path):
+        """
+        Constructor class. The store is created when the first object is added.
+
+        Params
+        ======
+        path: str
+            The folder of the store.
+        """
+        self.path = Path(path).resolve()
+
+        # Manifests of parallel workspace writes must not interleave
+        self.lock = threading.Lock()
+
+
+    def object(self, digest):
+        """
+        Returns the path of the object of the given hash.
+        """
+        return self.path / "objects" / digest[:2] / digest[2:]
+
+
+    def put(self, path):
+        """
+        Stores the file at path, then replaces it by a hardlink to its object.
+
+        Params
+        ======
+        path: Path
+            The case file.
+
+        Returns
+        =======
+        digest: str
+            The hash of the file if it could not be linked to its object, in which case the file is removed and must be listed in a manifest, or None if it was linked.
+        """
+        digest = file_hash(path)
+        obj = self.object(digest)
+
+        obj.parent.mkdir(parents=True, exist_ok=True)
+
+        if not obj.exists():
+            try:
+                os.link(path, obj)
+
+            # Another workspace stored the same object in the meantime
+            except FileExistsError:
+                pass
+
+            # Copy the file in, atomically, where it cannot be linked
+            except OSError:
+                tmp = Path(tempfile.mkstemp(dir=obj.parent, prefix=".tmp")[1])
+
+                try:
+                    shutil.copyfile(path, tmp)
+                    os.replace(tmp, obj)
+
+                except BaseException:
+                    tmp.unlink(missing_ok=True)
+
+                    raise
+
+            os.chmod(obj, 0o444)
+
+        if os.path.samefile(path, obj):
+            return None
+
+        # Replace the file by a hardlink, atomically
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+        try:
+            os.link(obj, tmp)
+            os.replace(tmp, path)
+
+            return None
+
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+        path.unlink()
+
+        return digest
+
+
+    def add_folder(self, folder, final=None):
+        """
+        Stores every case file in the case folder. Files that could not be linked to their objects are listed in the manifest of the folder, which is then registered with the store.
+
+        Params
+        ======
+        folder: Path
+            The case folder.
+        final: Path
+            The path the case folder is moved to once written, see writers.FolderWriter, under which its manifest is registered. By default, the case folder itself.
+
+        Returns
+        =======
+        stored: int
+            The number of case files stored.
+        """
+        folder = Path(folder).resolve()
+        manifest_path = folder / OBJECTS_NAME
+
+        unlinked = {}
+        stored = 0
+
+        for path in sorted(folder.iterdir()):
+
+            # Skip the manifests and other hidden files
+            if path.name.startswith(".") or path.is_symlink() or not path.is_file():
+                continue
+
+            digest = self.put(path)
+            stored += 1
+
+            if digest is not None:
+                unlinked[path.name] = digest
+
+        if unlinked:
+            manifest = read_manifest(manifest_path)
+            manifest["store"] = str(self.path)
+            manifest["cases"].update(unlinked)
+
+            tmp = manifest_path.with_name(f"{OBJECTS_NAME}.{os.getpid()}.tmp")
+
+            with open(tmp, "w") as fw:
+                json.dump(manifest, fw)
+
+            os.replace(tmp, manifest_path)
+
+            self.register(Path(final or folder) / OBJECTS_NAME)
+
+        return stored
+
+
+    def register(self, manifest_path):
+        """
+        Registers a manifest with the store, so that its objects are kept by gc().
+        """
+        with self.lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+            with (self.path / MANIFESTS_NAME).open("a") as fw:
+                fw.write(f"{Path(manifest_path).resolve()}\n")
+
+
+    def gc(self, dry_run=False):
+        """
+        Removes the objects that are neither hardlinked from a workspace nor listed in a registered manifest. Manifests that no longer exist are unregistered.
+
+        Params
+        ======
+        dry_run: bool
+            Whether to only count the objects that would be removed.
+
+        Returns
+        =======
+        removed: int
+            The number of objects removed.
+        freed: int
+            The number of bytes freed.
+        """
+        removed = freed = 0
+
+        if not self.path.exists():
+            return removed, freed
+
+        with self.lock:
+            manifests_path = self.path / MANIFESTS_NAME
+
+            try:
+                with manifests_path.open("r") as fr:
+                    manifests = list(dict.fromkeys(line.strip() for line in fr if line.strip()))
+
+            except FileNotFoundError:
+                manifests = []
+
+            referenced = set()
+            kept = []
+
+            for m in manifests:
+                manifest = read_manifest(m)
+
+                if manifest["store"] == str(self.path):
+                    referenced.update(manifest["cases"].values())
+                    kept.append(m)
+
+            for obj in (self.path / "objects").glob("*/*"):
+                digest = obj.parent.name + obj.name
+                stat = obj.stat()
+
+                # An object linked from nowhere else has a single link
+                if stat.st_nlink > 1 or digest in referenced or obj.name.startswith("."):
+                    continue
+
+                removed += 1
+                freed += stat.st_size
+
+                if not dry_run:
+                    obj.unlink()
+
+            if not dry_run:
+                with manifests_path.open("w") as fw:
+                    fw.writelines(f"{m}\n" for m in kept)
+
+        return removed, freed
+
+
+def read_manifest(path):
+    """
+    Reads the manifest at path, or returns an empty manifest if it is missing or corrupt.
+    """
+    try:
+        with open(path, "r") as fr:
+            manifest = json.load(fr)
+
+        return {"store": manifest["store"], "cases": dict(manifest["cases"])}
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return {"store": None, "cases": {}}
+
+
+# === Script ===
+if __name__ == "__main__":
+    conf_file = Path().cwd() / "configs.json"
+
+    with conf_file.open("r") as fr:
+        configs = json.load(fr)
+
+    ap = ArgumentParser(description="Manages the shared store of case files.")
+    ap.add_argument("command", choices=["gc", "add"])
+    ap.add_argument("folders", nargs="*", help="Case folders to move into the store, for add.")
+    ap.add_argument("--store", default=str(Path().cwd().parent.parent / configs["store"]["path"]), help="Folder of the store.")
+    ap.add_argument("--dry-run", action="store_true", help="Only report the objects gc would remove.")
+
+    args = ap.parse_args()
+
+    store = ObjectStore(args.store)
+
+    if args.command == "gc":
+        removed, freed = store.gc(args.dry_run)
+
+        print(f"{'Would remove' if args.dry_run else 'Removed'} {removed} objects, {freed / 1024 / 1024:.2f} MB.")
+
+    else:
+        for f in args.folders:
+            print(f"{f}: {store.add_folder(f)} case files stored.")
@@ -0,0 +1,164 @@
+# === Stress test ===
+"""
+Stress tests functions.main against a slow but trusted reference solution on random inputs, across all cores.
+
+The workspace needs
+ - generator.py, defining generate(n, rng), which returns the input string of a case of size n using rng, a random.Random
+ - brute.py, a copy of functions.py whose main() is a brute-force solution
+
+Run it from the workspace with
+    python stress.py --cases 10000 --max-n 10 --seed 1
+
+The run stops at the first disagreement, which is saved into test_cases/ with the reference's answer, to be picked up by py.test. Each case is seeded from the seed and its index, so a run is reproducible.
+"""
+from pathlib import Path
+import os
+import io
+import random
+import time
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+
+from argparse import ArgumentParser
+
+import test_functions as tf
+
+# Set in each worker by init()
+generate = None
+brute = None
+
+
+def load(path, name):
+    """
+    Loads the module at path under the given name.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def init(generator_path, brute_path):
+    """
+    Loads the generator and the reference solution in a worker.
+    """
+    global generate, brute
+
+    generate = load(generator_path, "generator").generate
+    brute = load(brute_path, "brute")
+
+
+def check(i, seed, max_n):
+    """
+    Runs case i of the seed through both the reference solution and functions.main.
+
+    Returns
+    =======
+    failure: tuple
+        None if both agree. Otherwise a (case index, inputs, reference answer, error) tuple, where the reference answer is None if the reference solution itself failed.
+    """
+    rng = random.Random(f"{seed}-{i}")
+    inputs = generate(rng.randint(1, max_n), rng)
+
+    result, expected = tf.execute(inputs, measure_memory=False, module=brute)
+
+    if result["error"] is not None:
+        return i, inputs, None, repr(result["error"])
+
+    expected = expected.read()
+
+    result, answers = tf.execute(inputs, measure_memory=False)
+
+    try:
+        if result["error"] is not None:
+            raise result["error"]
+
+        tf.compare(io.StringIO(expected), answers)
+
+    except BaseException as e:
+        return i, inputs, expected, str(e) or repr(e)
+
+    return None
+
+
+def stress(cases, max_n, seed, generator_path="generator.py", brute_path="brute.py", workers=None):
+    """
+    Runs the cases in parallel in chunks, stopping at the first chunk with a disagreement.
+
+    Returns
+    =======
+    failure: tuple
+        The failure of the lowest failing case index, as returned by check(), or None if all cases agree.
+    """
+    workers = workers or os.cpu_count()
+    chunk = workers * 64
+
+    start_time = time.perf_counter()
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init, initargs=(generator_path, brute_path)) as ex:
+        for lo in range(0, cases, chunk):
+            indices = range(lo, min(lo + chunk, cases))
+
+            # Results come back in index order, so the first failure is the lowest index
+            failure = next((r for r in ex.map(check, indices, [seed] * len(indices), [max_n] * len(indices), chunksize=16) if r), None)
+
+            done = indices[-1] + 1 if failure is None else failure[0] + 1
+            elapsed = time.perf_counter() - start_time
+
+            print(f"{done} cases, {done / elapsed:.0f} cases per second", end="\r")
+
+            if failure:
+                break
+
+    print()
+
+    return failure
+
+
+def save(folder, seed, failure):
+    """
+    Saves the inputs and reference answer of the failure as a case file in folder.
+
+    Returns
+    =======
+    path: Path
+        The path of the case file.
+    """
+    i, inputs, expected, _ = failure
+
+    path = Path(folder) / f"stress_{seed}_{i}.txt"
+
+    with path.open("w") as fw:
+        fw.write(inputs.strip())
+        fw.write("\n---\n")
+        fw.write(expected.strip())
+
+    return path
+
+
+# === Script ===
+if __name__ == "__main__":
+    ap = ArgumentParser(description="Stress tests functions.main against a reference solution.")
+    ap.add_argument("--cases", type=int, default=10000, help="Number of random cases.")
+    ap.add_argument("--max-n", type=int, default=10, help="Largest input size passed to the generator.")
+    ap.add_argument("--seed", type=int, default=0, help="Seed of the run.")
+    ap.add_argument("--generator", default="generator.py", help="Module defining generate(n, rng).")
+    ap.add_argument("--brute", default="brute.py", help="Reference solution, in the form of functions.py.")
+    ap.add_argument("--workers", type=int, help="Number of processes, by default one per core.")
+    ap.add_argument("--folder", default="test_cases", help="Folder to save a failing case into.")
+
+    args = ap.parse_args()
+
+    failure = stress(args.cases, args.max_n, args.seed, args.generator, args.brute, args.workers)
+
+    if failure is None:
+        print(f"All {args.cases} cases agree.")
+
+    elif failure[2] is None:
+        print(f"Case {failure[0]}: the reference solution failed with {failure[3]}\nInputs:\n{failure[1]}")
+
+    else:
+        print(f"Case {failure[0]} disagrees:\n{failure[3]}")
+        print(f"Saved to {save(args.folder, args.seed, failure)}")
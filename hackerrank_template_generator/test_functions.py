@@ -1,5 +1,20 @@
 # === Script variables  ===
-TIME_LIMIT = 10     # Default time limit
+TIME_LIMIT = 10     # Default time limit in seconds, if configs.json in the workspace has none for its language
+MEMORY_LIMIT = 512  # Default memory limit in megabytes, if configs.json in the workspace has none
+ISOLATE = True      # Whether to run each case in its own child process under hard CPU time and memory limits, like HackerRank. Needs the resource module, i.e. not Windows
+PARALLEL = False    # Whether to run cases in parallel, across a process pool sized to the machine
+COMPARE_MODE = "lines"  # "exact" lines, "lines" ignoring trailing whitespace like HackerRank, or whitespace-insensitive "tokens"
+FLOAT_TOLERANCE = None  # Absolute or relative tolerance when comparing numbers, e.g. 1e-6, or None to compare them as text
+DIFF_CONTEXT = 2        # Number of lines shown around a mismatch
+MEASURE_MEMORY = True   # Whether to measure the peak memory of each case with tracemalloc, which slows allocation-heavy solutions down
+PERF_HISTORY = ".perf_history.jsonl"    # File in the workspace that the performance of each run is appended to
+REGRESSION_MARGIN = 0.2 # Fraction by which a case may be slower or use more memory than its baseline before it is flagged
+BASELINE_RUNS = 5       # Number of previous passing runs of a case whose median is its baseline
+SELECT = None       # Only run the cases whose names match this glob, e.g. "sample_*", or regex, e.g. re.compile("0[0-4]$"), or None to run all
+TAGS = []           # Only run the cases with all of these tags: "small" (under 1 KB), "failed" (failed in the last run), or any listed in a case's comments as "tags: a, b"
+RESULTS_CACHE = ".results_cache.json"  # File in the workspace that passing results are cached in, to skip their cases until the solution, harness, case or limits change. None, or py.test --no-cache, runs every case
+LANGUAGE = None      # Language of the solution, e.g. "C++" for solution.cpp or "Java 8" for Solution.java, see runners.py. None for the language in configs.json
+COMPILE_FLAGS = None # Compiler flags of solutions in compiled languages, or None for the defaults of runners.py
 
 # === Imports ===
 import pytest
@@ -8,7 +23,36 @@ import warnings
 
 import json
 import os
+import sys
+import io
 from pathlib import Path
+from contextlib import redirect_stdout
+
+import importlib
+import pickle
+import time
+import signal
+import multiprocessing
+from multiprocessing.connection import wait
+import tracemalloc
+import math
+import re
+import fnmatch
+import hashlib
+import mmap
+import gzip
+import lzma
+import tokenize
+from collections import deque
+from itertools import zip_longest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Hard limits are only available on Unix
+try: 
+    import resource
+
+except ImportError:
+    resource = None
 
 import functions as fnc
 
@@ -17,6 +61,59 @@ from func_timeout.exceptions import FunctionTimedOut
 
 from datetime import datetime
 
+# === Limits ===
+# Languages run by this script itself. Other languages are run by runners.py
+PYTHON_LANGUAGES = ["Python 3", "PyPy 3"]
+
+
+def load_configs(path=Path(__file__).parent / "configs.json"):
+    """
+    Loads configs.json of the workspace, or returns {} if it is missing or corrupt.
+    """
+    try: 
+        with open(path) as fr:
+            return json.load(fr)
+
+    except (OSError, ValueError):
+        return {}
+
+
+def load_limits(configs, language):
+    """
+    Loads the limits of the language from the configs, i.e. HackerRank's base time limit scaled by the language's multiplier, and its memory limit.
+
+    Returns
+    =======
+    time_limit: float
+        The time limit in seconds, or TIME_LIMIT if configs.json has no limits.
+    memory_limit: int
+        The memory limit in megabytes, or MEMORY_LIMIT if configs.json has no limits.
+    """
+    try: 
+        limits = configs["limits"]
+
+        return limits["time"] * limits["multipliers"].get(language, 1), limits["memory_mb"]
+
+    except (KeyError, TypeError):
+        return TIME_LIMIT, MEMORY_LIMIT
+
+
+CONFIGS = load_configs()
+LANGUAGE = LANGUAGE or CONFIGS.get("language", "Python 3")
+TIME_LIMIT, MEMORY_LIMIT = load_limits(CONFIGS, LANGUAGE)
+
+
+def load_runner(language=LANGUAGE):
+    """
+    Returns the runner of the solution if it is in a compiled language, see runners.py, or None if it is functions.py.
+    """
+    if language in PYTHON_LANGUAGES:
+        return None
+
+    import runners
+
+    return runners.Runner(language, flags=COMPILE_FLAGS)
+
 # === Debug function ===
 def DEBUG(*args, **kwargs):
     """
@@ -26,32 +123,338 @@ def DEBUG(*args, **kwargs):
 
 
 # === Test function ===
+# Name of the manifest of the case files in each case folder
+INDEX_NAME = ".index.json"
+
+# Version of the entries in the manifests, bumped whenever scan_case() changes, so that older manifests are rebuilt
+INDEX_VERSION = 2
+
+# Case files of at least this many bytes are memory-mapped rather than read
+MMAP_SIZE = 1024 * 1024
+
+# Case files under this many bytes are tagged "small"
+SMALL_SIZE = 1024
+
+# Openers of compressed case files, by the suffix of their file names, see writers.TestCaseWriter
+DECOMPRESSORS = {".gz": gzip.open, ".xz": lzma.open}
+
+# Number of decompressed bytes a compressed case file is read in at a time
+CHUNK_SIZE = 1024 * 1024
+
+
+class InvalidCaseFile(Exception):
+    """
+    A case file has no separator between its inputs and outputs.
+    """
+
+# Name of the manifest of the case files of a case folder that are kept in the shared case store rather than in the folder, see store.py
+OBJECTS_NAME = ".objects.json"
+
+
+def read_case_file(fr, size):
+    """
+    Returns the contents of the open case file as a bytes-like object, memory-mapped if it is large. Memory maps must be closed by the caller.
+    """
+    if size >= MMAP_SIZE:
+        return mmap.mmap(fr.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return fr.read()
+
+
+def decompressor(name):
+    """
+    Returns the opener of the case file of the given name if it is compressed, or None.
+    """
+    return DECOMPRESSORS.get(Path(name).suffix)
+
+
+def find_separators(chunks, separator, limit=4):
+    """
+    Finds the first separators in a stream of chunks, which a separator may straddle.
+
+    Params
+    ======
+    chunks: iterable
+        The contents, as bytes-like chunks.
+    separator: bytes
+        The separator.
+    limit: int
+        The number of separators after which the search stops. The remaining chunks are still consumed.
+
+    Returns
+    =======
+    positions: []
+        Array of the byte offsets of the separators found, in order.
+    size: int
+        The total number of bytes of the chunks.
+    """
+    positions = []
+
+    # Bytes of the previous chunk that a separator may start in, and their offset
+    carry = b""
+    base = 0
+
+    # Offset from which the next separator is searched for, so that separators do not overlap
+    start = 0
+
+    for chunk in chunks:
+        # Memory maps are searched in place rather than copied
+        buffer = carry + chunk if carry else chunk
+
+        while len(positions) < limit:
+            end = buffer.find(separator, max(0, start - base))
+
+            if end == -1:
+                break
+
+            positions.append(base + end)
+            start = base + end + len(separator)
+
+        keep = min(len(buffer), len(separator) - 1)
+        base += len(buffer) - keep
+        carry = bytes(buffer[len(buffer) - keep:])
+
+    return positions, base + len(carry)
+
+
+def split_spans(positions, size, sep_size):
+    """
+    Returns the [start, end) byte offsets of the inputs, outputs and, if any, comments of a case file from the offsets of its first separators.
+    """
+    spans = []
+    start = 0
+
+    for end in positions[:3]:
+        spans.append([start, end])
+        start = end + sep_size
+
+    if len(spans) < 3:
+        spans.append([start, size])
+
+    # Comments only count if the file has exactly three parts
+    if len(positions) >= 3:
+        spans = spans[:2]
+
+    return spans
+
+
+def read_chunks(fr, chunk_size=CHUNK_SIZE):
+    """
+    Yields the contents of the open file in chunks.
+    """
+    for chunk in iter(lambda: fr.read(chunk_size), b""):
+        yield chunk
+
+
+def scan_case(path, sep="---", name=None):
+    """
+    Scans a case file for its index entry. Compressed case files are decompressed in a stream.
+
+    Params
+    ======
+    path: Path
+        The case file.
+    sep: str
+        The substring separating the input from the output from the comments.
+    name: str
+        The file name of the case, whose suffix tells whether it is compressed. By default, that of path.
+
+    Returns
+    =======
+    entry: {}
+        Dictionary with the following fields:
+         - "size": The size of the file in bytes
+         - "hash": The SHA-256 of its contents, decompressed
+         - "spans": Array of the [start, end) byte offsets of the inputs, outputs and, if any, comments, decompressed
+         - "tags": Array of its tags
+
+    Raises
+    ======
+    InvalidCaseFile:
+        If the file has no separator between its inputs and outputs.
+    """
+    separator = sep.encode("utf-8")
+    opener = decompressor(name or path.name)
+
+    if opener:
+        digest = hashlib.sha256()
+
+        def hashed(chunks):
+            for chunk in chunks:
+                digest.update(chunk)
+                yield chunk
+
+        size = os.stat(path).st_size
+
+        with opener(path, "rb") as fr:
+            positions, length = find_separators(hashed(read_chunks(fr)), separator)
+
+        digest = digest.hexdigest()
+        spans = split_spans(positions, length, len(separator))
+
+        # Comments are read in a second pass, as they are only known once the whole file is scanned
+        comments = ""
+
+        if len(spans) == 3:
+            with opener(path, "rb") as fr:
+                fr.seek(spans[2][0])
+                comments = decode_part(fr.read(spans[2][1] - spans[2][0]))
+
+    else:
+        with open(path, "rb") as fr:
+            size = os.fstat(fr.fileno()).st_size
+            contents = read_case_file(fr, size) if size else b""
+
+            try: 
+                digest = hashlib.sha256(contents).hexdigest()
+
+                # The case files are structured such that it has INPUTS, followed by the separator substring, followed by the OUTPUTS, optionally followed by the separator substring and COMMENTS
+                positions, length = find_separators([contents], separator)
+                spans = split_spans(positions, length, len(separator))
+
+                comments = decode_part(contents[slice(*spans[2])]) if len(spans) == 3 else ""
+
+            finally:
+                if isinstance(contents, mmap.mmap):
+                    contents.close()
+
+    if len(spans) < 2:
+        raise InvalidCaseFile(f"The case file '{path}' has no '{sep}' separator.")
+
+    tags = ["small"] if length < SMALL_SIZE else []
+
+    for line in re.findall("^\\s*tags:(.*)$", comments, re.M | re.I):
+        tags += [t for t in re.split("[\\s,]+", line) if t]
+
+    return {"size": size, "hash": digest, "spans": spans, "tags": tags}
+
+
+def decode_part(part):
+    """
+    Decodes a part of a case file, with newlines normalised and surrounding whitespace stripped.
+    """
+    return part.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def case_files(p):
+    """
+    Returns the path of each case file of the folder, by file name. Case files kept in the shared case store and listed in the objects manifest of the folder are read through from the store.
+    """
+    files = {}
+
+    try: 
+        with open(p / OBJECTS_NAME) as fr:
+            manifest = json.load(fr)
+
+        # Objects are kept at objects/<first 2 hex digits>/<remaining hex digits> of their hash, as in store.py
+        for name, digest in manifest["cases"].items():
+            files[name] = Path(manifest["store"]) / "objects" / digest[:2] / digest[2:]
+
+    # Folders without a manifest keep all their case files
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    for path in p.iterdir():
+
+        # Skip the manifests and other hidden files
+        if not path.name.startswith(".") and path.is_file():
+            files[path.name] = path
+
+    return dict(sorted(files.items()))
+
+
+def index_cases(p, sep="---", files=None):
+    """
+    Indexes the case files in the folder, rescanning only those that are new or changed since the manifest in the folder was written. The manifest is then updated.
+
+    Params
+    ======
+    p: Path
+        The case folder.
+    sep: str
+        The substring separating the input from the output from the comments in each case file.
+    files: {}
+        The case files of the folder, as returned by case_files(), if already listed.
+
+    Returns
+    =======
+    entries: {}
+        Dictionary of the file name of each case to its entry, as returned by scan_case(), sorted by file name.
+    """
+    index_path = p / INDEX_NAME
+
+    try: 
+        with open(index_path) as fr:
+            index = json.load(fr)
+
+        indexed = index["cases"] if index["sep"] == sep and index.get("version") == INDEX_VERSION else {}
+
+    # A missing or corrupt manifest is rebuilt
+    except (OSError, ValueError, KeyError, TypeError):
+        indexed = {}
+
+    entries = {}
+    changed = False
+
+    for name, path in (files or case_files(p)).items():
+        stat = path.stat()
+        entry = indexed.get(name)
+
+        # Files are only rescanned when their size or modification time changes
+        if entry is None or entry.get("size") != stat.st_size or entry.get("mtime") != stat.st_mtime_ns:
+            entry = scan_case(path, sep, name)
+            entry["mtime"] = stat.st_mtime_ns
+            changed = True
+
+        entries[name] = entry
+
+    if changed or entries.keys() != indexed.keys():
+        try: 
+            tmp = index_path.with_name(f"{INDEX_NAME}.{os.getpid()}.tmp")
+
+            with open(tmp, "w") as fw:
+                json.dump({"version": INDEX_VERSION, "sep": sep, "cases": entries}, fw)
+
+            os.replace(tmp, index_path)
+
+        # Read-only folders are indexed on every run instead
+        except OSError:
+            pass
+
+    return entries
+
+
 def get_cases(f, sep="---"): 
     """
-    Extracts inputs and outputs for each test/verification case within f, where f is a folder.
+    Indexes each test/verification case within f, where f is a folder. The inputs, outputs and comments of a case are only read when first accessed.
 
     Params
     ======
     f: str
         The folder containing the cases to be extracted.
     sep: str
-        The substring separating comments from the input from the output in each case file. 
+        The substring separating the input from the output from the comments in each case file. 
 
     Returns 
     =======
     cases: []
-        Array of dictionaries containing each case
+        Array of Case of each case, sorted by file name.
 
         Each case is a dictionary with the following fields:
          - "filename": The name of the file
-         - "comments": Any comments in the folder
-         - "inputs": The inputs
-         - "outputs": The expected outputs
+         - "size": The size of the file in bytes
+         - "hash": The SHA-256 of the file
+         - "tags": Array of the tags of the case
+         - "inputs": The inputs, read on access
+         - "outputs": The expected outputs, read on access
+         - "comments": Any comments in the file, read on access
 
     Raises
     ======
     AssertionError:
         If the given path is not a folder.
+    InvalidCaseFile:
+        If a case file has no separator between its inputs and outputs.
     """
     # Initialise path
     p = Path(f)
@@ -59,43 +462,874 @@ def get_cases(f, sep="---"):
     # Assert that target folder is a folder
     assert p.is_dir()
 
-    # List of cases in the folder
-    cases = []
+    files = case_files(p)
+
+    return [Case(files[name], entry, name) for name, entry in index_cases(p, sep, files).items()]
+
+
+# === Case Class ===
+class Case(dict):
+    """
+    A case of a case file, whose inputs, outputs and comments are only read from the file when first accessed. Only their spans are read, so accessing one case costs only its own I/O.
+    """
+    def __init__(self, path, entry, name=None):
+        """
+        Params
+        ======
+        path: Path
+            The case file.
+        entry: {}
+            The index entry of the file, as returned by scan_case().
+        name: str
+            The file name of the case in its folder, by default that of path. Case files in the shared case store are named by their hash instead.
+        """
+        name = Path(name or path.name)
+        self.opener = decompressor(name)
+
+        # Compressed case files are named after their case too
+        if self.opener:
+            name = name.with_suffix("")
+
+        super().__init__(filename=name.with_suffix("").name, size=entry["size"], hash=entry["hash"], tags=entry["tags"])
+
+        self.path = path
+        self.spans = entry["spans"]
+
+
+    def __missing__(self, key):
+        if key not in ["inputs", "outputs", "comments"] or "inputs" in self.keys():
+            raise KeyError(key)
+
+        self.load()
+
+        return super().__getitem__(key)
+
+
+    def load(self):
+        """
+        Reads the inputs, outputs and comments of the case from its file. Compressed case files are decompressed in a stream, one part at a time.
+        """
+        if self.opener:
+            parts = []
+
+            with self.opener(self.path, "rb") as fr:
+                for start, end in self.spans:
+                    # Skip the separators, decompressing them on the way
+                    fr.seek(start)
+                    parts.append(decode_part(fr.read(end - start)))
+
+        else:
+            parts = self.read()
+
+        for key, part in zip(["inputs", "outputs", "comments"], parts):
+            self[key] = part
+
+
+    def read(self):
+        """
+        Returns the inputs, outputs and comments of the case from its uncompressed file, memory-mapped if large.
+        """
+        with open(self.path, "rb") as fr:
+            contents = read_case_file(fr, self["size"])
+
+            try: 
+                parts = [decode_part(contents[start:end]) for start, end in self.spans]
+
+            finally:
+                if isinstance(contents, mmap.mmap):
+                    contents.close()
+
+        return parts
+
+
+# === Comparison ===
+class Mismatch(AssertionError):
+    """
+    Raised when an answer differs from the expected output.
+    """
+    def __init__(self, line, column, report):
+        """
+        Params
+        ======
+        line: int
+            The line of the answer where it first differs.
+        column: int
+            The column of the answer where it first differs.
+        report: str
+            The description of the mismatch, with its context.
+        """
+        super().__init__(report)
+
+        self.line = line
+        self.column = column
+
+
+    def __reduce__(self):
+        # Rebuilt from its own arguments when sent back from a child process
+        return Mismatch, (self.line, self.column, self.args[0])
+
+
+def numbered_lines(f, mode):
+    """
+    Yields the line number and line of each line in f, without line endings and skipping leading blank lines. Trailing whitespace is removed unless in "exact" mode.
+    """
+    started = False
+
+    for n, line in enumerate(f, 1):
+        line = line.rstrip("\r\n") if mode == "exact" else line.rstrip()
+
+        if not started and not line.strip():
+            continue
+
+        started = True
+
+        yield n, line
+
+
+def numbered_tokens(f):
+    """
+    Yields the line number, column and token of each whitespace-separated token in f.
+    """
+    for n, line in enumerate(f, 1):
+        for m in re.finditer(r"\S+", line):
+            yield n, m.start() + 1, m.group()
+
+
+def tokens_equal(e, a, tolerance):
+    """
+    Returns whether tokens e and a are equal, or both numbers within the tolerance if it is not None.
+    """
+    if e == a:
+        return True
+
+    if tolerance is None:
+        return False
+
+    try: 
+        return math.isclose(float(e), float(a), rel_tol=tolerance, abs_tol=tolerance)
+
+    except ValueError:
+        return False
+
+
+def first_difference(e, a, tolerance):
+    """
+    Returns the column where line a first differs from line e, or None if they are equal. With a tolerance, the lines are compared token by token.
+    """
+    if e == a:
+        return None
+
+    if tolerance is not None:
+        for em, am in zip_longest(re.finditer(r"\S+", e), re.finditer(r"\S+", a)):
+            if em is None or am is None or not tokens_equal(em.group(), am.group(), tolerance):
+                return (am or em).start() + 1
+
+        return None
+
+    for x, (i, j) in enumerate(zip(e, a)):
+        if i != j:
+            return x + 1
+
+    return min(len(e), len(a)) + 1
+
+
+def clip(line, column=1, width=80):
+    """
+    Returns the line clipped to width characters around the column.
+    """
+    start = max(0, min(column - 1 - width // 2, len(line) - width))
+
+    clipped = line[start:start + width]
+
+    return ("..." if start else "") + clipped + ("..." if start + width < len(line) else "")
+
+
+def compare(expected, answers, mode=COMPARE_MODE, tolerance=FLOAT_TOLERANCE, context=DIFF_CONTEXT):
+    """
+    Compares the answers to the expected output as streams, stopping at the first mismatch. Only the lines around the current line are held in memory.
+
+    Blank lines at the start and end are ignored.
+
+    Params
+    ======
+    expected: file
+        The expected output, as a text stream.
+    answers: file
+        The answers, as a text stream.
+    mode: str
+        "exact" to compare lines as they are, "lines" to ignore trailing whitespace on each line, or "tokens" to ignore all whitespace between tokens.
+    tolerance: float
+        The absolute or relative tolerance to compare numbers with, or None to compare them as text.
+    context: int
+        The number of lines shown before and after a mismatch.
+
+    Raises
+    ======
+    Mismatch:
+        If the answers differ from the expected output.
+    """
+    if mode == "tokens":
+        for e, a in zip_longest(numbered_tokens(expected), numbered_tokens(answers)):
+            if e is None or a is None or not tokens_equal(e[2], a[2], tolerance):
+                line, column = (a or e)[:2]
+
+                raise Mismatch(line, column, f"Answer differs at line {line}, column {column}: expected {e[2] if e else 'nothing'!r}, got {a[2] if a else 'nothing'!r}.")
+
+        return
+
+    before = deque(maxlen=context)
+    expected_lines = numbered_lines(expected, mode)
+    answer_lines = numbered_lines(answers, mode)
+
+    for e, a in zip_longest(expected_lines, answer_lines):
+        # Once either side runs out, the rest of the other may only be blank
+        if e is None or a is None:
+            if not (e or a)[1].strip():
+                continue
+
+        else:
+            column = first_difference(e[1], a[1], tolerance)
+
+            if column is None:
+                before.append((e, a))
+
+                continue
+
+        # Report the mismatch with its context
+        line, column = (a[0], column) if e and a else ((a or e)[0], 1)
+
+        report = [f"Answer differs at line {line}, column {column} (- expected, + answer):"]
+
+        for (_, el), (an, _) in before:
+            report.append(f"  {an:>6} | {clip(el)}")
+
+        after = list(zip(range(context), zip_longest(expected_lines, answer_lines)))
+
+        for x, (ex, ax) in [(0, (e, a))] + [(x + 1, pair) for x, pair in after]:
+            col = column if x == 0 else 1
+
+            # Following lines that match are shown once
+            if x and ex and ax and first_difference(ex[1], ax[1], tolerance) is None:
+                report.append(f"  {ax[0]:>6} | {clip(ax[1])}")
+
+                continue
+
+            if ex:
+                report.append(f"- {ex[0]:>6} | {clip(ex[1], col)}")
+
+            if ax:
+                report.append(f"+ {ax[0]:>6} | {clip(ax[1], col)}")
+
+        raise Mismatch(line, column, "\n".join(report))
+
+
+# === Verdicts ===
+class TimeLimitExceeded(Exception):
+    """
+    A case ran out of CPU time or wall time in its child process.
+    """
+
+
+class MemoryLimitExceeded(Exception):
+    """
+    A case was killed for running out of memory in its child process.
+    """
+
+
+def verdict(error):
+    """
+    Returns the verdict of a case from its error, as on HackerRank: "AC" if accepted, "WA" for a wrong answer, "TLE" and "MLE" for exceeding the time or memory limit, or "RE" for any other runtime error.
+    """
+    if error is None:
+        return "AC"
+
+    if isinstance(error, Mismatch):
+        return "WA"
+
+    if isinstance(error, (TimeLimitExceeded, FunctionTimedOut)):
+        return "TLE"
+
+    if isinstance(error, (MemoryLimitExceeded, MemoryError)):
+        return "MLE"
+
+    return "RE"
+
+
+def picklable(error):
+    """
+    Returns the error, or a plain Exception with its repr if it cannot be sent to another process.
+    """
+    try: 
+        pickle.loads(pickle.dumps(error))
+
+    except Exception:
+        return Exception(repr(error))
+
+    return error
+
+
+# === Execute ===
+def execute(inputs, measure_memory=MEASURE_MEMORY, module=None, limit_time=True):
+    """
+    Runs fnc.main on the inputs, measuring its performance.
+
+    Params
+    ======
+    inputs: str
+        The inputs to be mocked by input() and sys.stdin.
+    measure_memory: bool
+        Whether to measure the peak memory with tracemalloc.
+    module: module
+        The module to run main() of instead of fnc, e.g. a brute-force solution with the same mocks as functions.py.
+    limit_time: bool
+        Whether to stop main() after TIME_LIMIT seconds. Disabled when the time is limited by the caller, see run_limited().
+
+    Returns
+    =======
+    result: {}
+        Dictionary with the following fields:
+         - "error": The error raised by fnc.main, or None if it succeeded
+         - "wall": The wall time of fnc.main in seconds
+         - "cpu": The CPU time of fnc.main in seconds
+         - "memory": The peak memory allocated by fnc.main in bytes, or None if not measured
+    answers: file
+        The answers, as a text stream.
+    """
+    result = {"error": None, "wall": None, "cpu": None, "memory": None}
+
+    module = module or fnc
+
+    # Instantiate fnc arguments
+    module.set_inputs(inputs)
+
+    # Solutions reading sys.stdin or sys.stdin.buffer directly get the inputs too, from the same stream as input()
+    stdin = sys.stdin
+    sys.stdin = module.stdin
+
+    # Anything printed to stdout is captured too, as some challenges are answered on stdout instead of fptr
+    stdout = module.Writer()
+
+    if measure_memory:
+        tracemalloc.start()
+
+    wall, cpu = time.perf_counter(), time.process_time()
+
+    # Run function
+    try: 
+        with redirect_stdout(stdout):
+            if limit_time:
+                fto(
+                    TIME_LIMIT,
+                    module.main,
+                    (inputs, )
+                )
+
+            else:
+                module.main(inputs)
+
+    # If the function times out, return it as an error
+    except FunctionTimedOut as e:
+        result["error"] = e
+
+    # For any other exception, we also return it as an error
+    # The reason we separate FunctionTimedOut from Exception is because FunctionTimedOut is not considered an Exception by the program
+    except Exception as e:
+        result["error"] = e
+
+    finally:
+        result["wall"] = time.perf_counter() - wall
+        result["cpu"] = time.process_time() - cpu
+
+        if measure_memory:
+            result["memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        sys.stdin = stdin
+
+    # Like HackerRank, stdout is only checked if nothing was written to fptr
+    answers = module.fptr if module.fptr.size else stdout
+
+    return result, answers.get_answers()
+
+
+def run_case(c, limit_time=True, runner=None):
+    """
+    Runs fnc.main, or the compiled solution of the runner, on the case and checks its answer, measuring its performance.
+
+    Params
+    ======
+    c: {}
+        The case, as returned by get_cases().
+    limit_time: bool
+        Whether execute() limits the time of fnc.main.
+    runner: runners.Runner
+        The built runner of a solution in a compiled language, which runs under hard limits by itself. If None, fnc.main is run.
+
+    Returns
+    =======
+    result: {}
+        The result of the case, as returned by execute(), with "error" set to the mismatch if the answer is wrong, and its "verdict".
+    """
+    if runner:
+        result, answers = runner.execute(c["inputs"])
+
+    else:
+        result, answers = execute(c["inputs"], limit_time=limit_time)
+
+    # If there are no exceptions, we check that the answer is correct
+    if result["error"] is None:
+        try: 
+            compare(io.StringIO(c["outputs"]), answers)
+
+        except Exception as e:
+            result["error"] = e
+
+    result["verdict"] = verdict(result["error"])
+
+    return result
+
+
+def run_worker(c):
+    """
+    Runs the case in a process pool worker. 
+
+    The functions module is reloaded first, so that no state, e.g. fnc.fptr and fnc.stdin, carries over from the cases previously run by the worker.
+
+    Params
+    ======
+    c: {}
+        The case, as returned by get_cases().
+
+    Returns
+    =======
+    result: {}
+        The result of the case, as returned by run_case().
+    """
+    importlib.reload(fnc)
+
+    result = run_case(c)
+
+    # The error is sent back to the parent process, which not all exceptions survive
+    result["error"] = picklable(result["error"])
+
+    return result
+
+
+# === Isolation ===
+def limited_worker(c, conn, time_limit, memory_limit):
+    """
+    Runs the case in a child process under hard CPU time and memory limits, sending its result through conn.
+
+    Params
+    ======
+    c: {}
+        The case, as returned by get_cases().
+    conn: Connection
+        The sending end of a pipe to the parent process.
+    time_limit: float
+        The CPU time limit in seconds. The kernel kills the process with SIGXCPU once it is exceeded.
+    memory_limit: int
+        The address space limit in megabytes. Allocations beyond it raise MemoryError.
+    """
+    # CPU time is limited in whole seconds
+    cpu = math.ceil(time_limit)
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+
+    memory = memory_limit * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+    start = time.perf_counter()
+
+    try: 
+        result = run_case(c, limit_time=False)
+
+    # Errors outside of fnc.main, e.g. running out of memory while mocking the inputs
+    except Exception as e:
+        result = {"error": e, "wall": time.perf_counter() - start, "cpu": None, "memory": None, "verdict": verdict(e)}
+
+    result["error"] = picklable(result["error"])
+
+    conn.send(result)
+    conn.close()
+
+
+def killed(exitcode, time_limit, memory_limit):
+    """
+    Returns the error of a child process that exited with the exit code without sending a result.
+    """
+    # Windows has neither signal
+    sigxcpu, sigkill = getattr(signal, "SIGXCPU", None), getattr(signal, "SIGKILL", None)
+
+    if sigxcpu and exitcode == -sigxcpu:
+        return TimeLimitExceeded(f"Exceeded the CPU time limit of {time_limit} s.")
+
+    # Out of memory killers use SIGKILL
+    if sigkill and exitcode == -sigkill:
+        return MemoryLimitExceeded(f"Killed, most likely for exceeding the memory limit of {memory_limit} MB.")
+
+    if exitcode < 0:
+        return RuntimeError(f"Killed by {signal.Signals(-exitcode).name}.")
+
+    return RuntimeError(f"Exited with code {exitcode}.")
+
+
+def run_limited(cases, workers=1, time_limit=None, memory_limit=None):
+    """
+    Runs each case in its own child process under hard limits, with up to workers children at a time. Each child is forked from this process, so it starts with a fresh functions module.
+
+    Sleeping or blocked solutions use no CPU time, so children are also killed after twice the time limit of wall time.
+
+    Params
+    ======
+    cases: []
+        Array of the cases, as returned by get_cases().
+    workers: int
+        The number of children run at a time.
+    time_limit: float
+        The time limit in seconds, by default TIME_LIMIT.
+    memory_limit: int
+        The memory limit in megabytes, by default MEMORY_LIMIT.
+
+    Yields
+    ======
+    result: {}
+        The result of each case in order, as returned by run_case().
+    """
+    time_limit = time_limit or TIME_LIMIT
+    memory_limit = memory_limit or MEMORY_LIMIT
+    wall_limit = time_limit * 2
+
+    ctx = multiprocessing.get_context("fork")
+
+    pending = deque(enumerate(cases))
+    running = {}
+    done = {}
+    next_cx = 0
+
+    while pending or running:
+        # Start children up to the number of workers
+        while pending and len(running) < workers:
+            cx, c = pending.popleft()
+
+            receiver, sender = ctx.Pipe(duplex=False)
+            p = ctx.Process(target=limited_worker, args=(c, sender, time_limit, memory_limit))
+            p.start()
+            sender.close()
+
+            running[receiver] = (cx, p, time.perf_counter())
+
+        # Wait for a child to finish, or until the earliest wall time deadline
+        deadline = min(start for _, _, start in running.values()) + wall_limit
+        ready = wait(list(running), timeout=max(0, deadline - time.perf_counter()))
+
+        for receiver, (cx, p, start) in list(running.items()):
+            wall = time.perf_counter() - start
+
+            if receiver not in ready and wall < wall_limit:
+                continue
+
+            result = None
+
+            if receiver in ready:
+                try: 
+                    result = receiver.recv()
+
+                # The child died without sending its result
+                except EOFError:
+                    pass
+
+                # A finished child exits by itself
+                p.join(1)
+
+            p.kill()
+            p.join()
+            receiver.close()
+            del running[receiver]
+
+            if result is None:
+                if receiver in ready:
+                    error = killed(p.exitcode, time_limit, memory_limit)
+
+                else:
+                    error = TimeLimitExceeded(f"Exceeded the wall time limit of {wall_limit} s.")
+
+                result = {"error": error, "wall": wall, "cpu": None, "memory": None, "verdict": verdict(error)}
+
+            done[cx] = result
+
+        # Yield in case order
+        while next_cx in done:
+            yield done.pop(next_cx)
+            next_cx += 1
+
+
+# === Results cache ===
+# Number of passing results kept in the results cache, most recent first
+RESULTS_CACHE_SIZE = 1000
+
+
+def source_hash(path):
+    """
+    Returns the SHA-256 of the Python source at path, ignoring comments and blank lines, so that editing them keeps the hash. Sources that do not tokenize are hashed as is.
+    """
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as fr:
+        try: 
+            for token in tokenize.tokenize(fr.readline):
+                if token.type in [tokenize.COMMENT, tokenize.NL]:
+                    continue
+
+                # The last line may or may not end in a newline
+                string = "" if token.type == tokenize.NEWLINE else token.string
+
+                digest.update(f"{token.type} {string}\n".encode("utf-8"))
+
+        except (tokenize.TokenError, SyntaxError):
+            fr.seek(0)
+            digest = hashlib.sha256(fr.read())
+
+    return digest.hexdigest()
+
+
+def solution_hash(runner=None):
+    """
+    Returns the hash of the solution and of the harness running it, i.e. functions.py, or the build of the runner and runners.py, and test_functions.py.
+    """
+    if runner:
+        import runners
+
+        solution = f"{runner.key()} {source_hash(runners.__file__)}"
+
+    else:
+        solution = source_hash(fnc.__file__)
+
+    return hashlib.sha256(f"{solution} {source_hash(__file__)}".encode("utf-8")).hexdigest()
+
+
+def result_key(solution, c, isolate):
+    """
+    Returns the key of the result of the case in the results cache, from the hash of the solution, the hash of the case file, and the limits and comparison it is run under.
+    """
+    key = [solution, c["hash"], TIME_LIMIT, MEMORY_LIMIT, isolate, COMPARE_MODE, FLOAT_TOLERANCE]
+
+    return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+
+
+def load_results(path):
+    """
+    Loads the results cache at path.
+
+    Returns
+    =======
+    results: {}
+        Dictionary of the key of each cached result, as returned by result_key(), to its "wall", "cpu" and "memory".
+    """
+    try: 
+        with open(path) as fr:
+            return json.load(fr)
+
+    # A missing or corrupt cache is started over
+    except (OSError, ValueError):
+        return {}
+
+
+def save_results(results, path, size=RESULTS_CACHE_SIZE):
+    """
+    Saves the most recently used results, i.e. the last of results, into the results cache at path.
+    """
+    results = dict(list(results.items())[-size:])
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+
+    with open(tmp, "w") as fw:
+        json.dump(results, fw)
+
+    os.replace(tmp, path)
+
+
+# === Performance ===
+def runner_key(runner=None):
+    """
+    Returns the key of the solution in the performance history, i.e. its language and the hash of its source, so that runs are only compared with runs of the same solution in the same language.
+    """
+    if runner:
+        return f"{runner.language} {hashlib.sha256(runner.source.read_bytes()).hexdigest()}"
+
+    return f"{LANGUAGE} {source_hash(fnc.__file__)}"
+
+
+def load_history(path=PERF_HISTORY):
+    """
+    Loads the performance history of all cases from the JSON-lines file at path.
+
+    Returns
+    =======
+    history: {}
+        Dictionary of (folder, case file name) to the list of its records, oldest first.
+    """
+    history = {}
+
+    if not Path(path).exists():
+        return history
+
+    with open(path) as fr:
+        for line in fr:
+            try: 
+                r = json.loads(line)
+
+            # Skip lines cut short by an interrupted run
+            except ValueError:
+                continue
+
+            history.setdefault((r["folder"], r["case"]), []).append(r)
+
+    return history
+
+
+def regressions(r, records, margin=REGRESSION_MARGIN, runs=BASELINE_RUNS):
+    """
+    Compares the record r to the baseline of the previous records of its case, i.e. the median of its last passing runs.
+
+    Returns
+    =======
+    flags: []
+        Array of the measures, of "wall" and "memory", that exceed the baseline by more than the margin.
+    """
+    records = [x for x in records if x["ok"]][-runs:]
+
+    if not records or not r["ok"]:
+        return []
+
+    flags = []
+
+    # Differences below 1 ms or 64 KB are noise
+    for measure, floor in [("wall", 1e-3), ("memory", 64 * 1024)]:
+        values = sorted(x[measure] for x in records if x[measure] is not None)
+
+        if r[measure] is None or not values:
+            continue
 
-    # Loop through all cases within the folder
-    for f in p.iterdir():
+        baseline = values[len(values) // 2]
 
-        # Open each case file
-        with open(f) as fr:
+        if r[measure] > baseline * (1 + margin) and r[measure] - baseline > floor:
+            flags.append(measure)
 
-            # Obtain the contents of the case file
-            contents = fr.read()
+    return flags
 
-            # The case files are structured such that it has COMMENTS, followed by the separator substring, followed by the INPUTS, followed by the separator substring, and finally followed by the OUTPUTS
 
-            # Instantiate case dictionary
-            c = {}
+def report(f, rows, key=None, path=PERF_HISTORY):
+    """
+    Prints a summary table of the performance of each case, slowest first, and appends it to the history at path. Cases that got slower or used more memory than their baseline, i.e. their previous runs with the same key, are flagged.
+
+    Params
+    ======
+    f: str
+        The name of the test folder.
+    rows: []
+        Array of (case, result) tuples, with the result as returned by run_case().
+    key: str
+        The key of the solution, as returned by runner_key(). By default, that of functions.py.
+    """
+    key = key or runner_key()
+
+    history = load_history(path)
+    now = datetime.now().isoformat(timespec="seconds")
 
-            # Separate the contents by the separator, and then clean each individual element of newline/whitespace
-            contents = contents.split(sep)
-            contents = [c.strip() for c in contents]
+    records = []
 
-            # Populate dictionary
-            c["filename"] = f.with_suffix("").name
-            c["inputs"] = contents[0]
-            c["outputs"] = contents[1]
+    for c, result in rows:
+        if result.get("cached"):
+            continue
 
-            if len(contents) == 3:
-                c["comments"] = contents[2]
+        records.append({
+            "time": now,
+            "folder": f,
+            "case": c["filename"],
+            "runner": key,
+            "ok": result["error"] is None,
+            "verdict": result["verdict"],
+            "wall": result["wall"],
+            "cpu": result["cpu"],
+            "memory": result["memory"]
+        })
 
-            # Add dictionary to list of cases
-            cases.append(c)
+    # Cached results are listed, but not appended to the history
+    cached = [{"case": c["filename"], "verdict": "cached", "ok": True, **{m: result[m] for m in ["wall", "cpu", "memory"]}} for c, result in rows if result.get("cached")]
 
-    # After all cases have been looped through, return cases
-    return cases
+    # Print summary table
+    print(f"\n({f}) {'case':<24} {'verdict':<8} {'wall (ms)':>10} {'cpu (ms)':>10} {'peak (MB)':>10}")
 
+    for r in sorted(records + cached, key=lambda x: -x["wall"]):
+        cpu = f"{r['cpu'] * 1000:.1f}" if r["cpu"] is not None else "-"
+        memory = f"{r['memory'] / 1024 / 1024:.2f}" if r["memory"] is not None else "-"
+        baseline = [x for x in history.get((f, r["case"]), []) if x.get("runner") == key]
+        flags = regressions(r, baseline) if r["verdict"] != "cached" else []
+        flags = f"  regressed: {', '.join(flags)}" if flags else ""
 
-def run_test(f, dcstr=[], dcix=[], raise_errors=True):
+        print(f"({f}) {r['case']:<24} {r['verdict']:<8} {r['wall'] * 1000:>10.1f} {cpu:>10} {memory:>10}{flags}")
+
+    # Append to history
+    with open(path, "a") as fw:
+        for r in records:
+            fw.write(json.dumps(r) + "\n")
+
+
+def select_cases(f, cases, dcstr=[], dcix=[], select=SELECT, tags=TAGS):
+    """
+    Selects the cases to run, without reading them from their files.
+
+    Params
+    ======
+    f: str
+        The name of the test folder.
+    cases: []
+        Array of the cases, as returned by get_cases().
+    dcstr, dcix, select, tags:
+        As in run_test().
+
+    Returns
+    =======
+    selected: []
+        Array of (index, case) tuples of the selected cases, in order.
+    """
+    if type(tags) == type(""):
+        tags = [tags]
+
+    # Cases whose last run failed
+    failed = set()
+
+    if "failed" in tags:
+        failed = {case for (folder, case), records in load_history().items() if folder == f and not records[-1]["ok"]}
+
+    selected = []
+
+    for cx, c in enumerate(cases):
+
+        # If cx is in dcix, ignore this case
+        # If the name of the case is in dcstr, we ignore the case
+        if cx in dcix or c["filename"] in dcstr:
+            continue
+
+        # Match the name of the case against the glob or regex
+        if type(select) == type("") and not fnmatch.fnmatchcase(c["filename"], select):
+            continue
+
+        if isinstance(select, re.Pattern) and not select.search(c["filename"]):
+            continue
+
+        # The case must have all the tags
+        case_tags = set(c["tags"]) | ({"failed"} if c["filename"] in failed else set())
+
+        if not set(tags) <= case_tags:
+            continue
+
+        selected.append((cx, c))
+
+    return selected
+
+
+def run_test(f, dcstr=[], dcix=[], raise_errors=True, parallel=PARALLEL, isolate=ISOLATE, select=SELECT, tags=TAGS, cache=True):
     """
     Runs the test required for all cases within the folder. Any cases within dcstr and dcix are ignored.
 
@@ -111,8 +1345,18 @@ def run_test(f, dcstr=[], dcix=[], raise_errors=True):
         Array of integers.
 
         Less reliable 'ignore' method. This ignores the 0-indexed element of the collected cases. 
+    select: str
+        Glob, or compiled regex searched for, that the names of the cases to run must match. If None, all cases are run.
+    tags: []
+        Array of tags that the cases to run must all have. Besides the tags of get_cases(), cases that failed in their last run are tagged "failed".
+    cache: bool
+        Whether to skip the cases whose results are in the results cache, RESULTS_CACHE, i.e. that passed with the same solution, harness, case file and limits.
     raise_errors: bool
         Whether any errors gathered while testing the cases should be returned. If false, only whether a case succeeded or failed is returned.
+    parallel: bool
+        Whether to run the cases in parallel across a process pool sized to the machine. Each case runs with its own fresh functions module.
+    isolate: bool
+        Whether to run each case in its own child process under hard time and memory limits. Ignored where the resource module is unavailable, and for compiled solutions, which always run in their own process.
     """
     # === Ensure that dcstr and dcix are lists ===
     # Check if dcstr is a list
@@ -181,63 +1425,108 @@ def run_test(f, dcstr=[], dcix=[], raise_errors=True):
     if not cases:
         raise Exception(f"There are no test cases in '{f}'.")
 
-    # === Loop through each case ===
-    for cx, c in enumerate(cases): 
-        
-        # If cx is in dcix, ignore this case
-        # If the name of the case is in dcstr, we ignore the case
-        if cx in dcix or c["filename"] in dcstr: 
-            continue 
+    # === Select cases ===
+    # Only the selected cases are read from their files
+    selected = select_cases(f, cases, dcstr, dcix, select, tags)
 
-        # Print out test case
-        print(f"({f}) test case {cx} '{c['filename']}': ", end="")
+    # === Build compiled solutions ===
+    # Solutions in other languages than Python are compiled once, or taken from the build cache
+    runner = load_runner()
 
-        # Instantiate fnc arguments
-        fnc.set_inputs(c["inputs"])
-        
-        # Get start time
-        start_time = datetime.now()
+    if runner:
+        runner.build()
 
-        # Run function
-        try: 
-            fto(
-                TIME_LIMIT,
-                fnc.main,
-                (c["inputs"], )
-            )
-
-        # If the function times out, add it as an error
-        except FunctionTimedOut as e:
-            c["errors"] = e 
-
-        # For any other exception, we also add it as an error
-        # The reason we separate FunctionTimedOut from Exception is because FunctionTimedOut is not considered an Exception by the program
-        except Exception as e:
-            c["errors"] = e
+    if isolate and resource is None:
+        warnings.warn("Hard limits need the resource module, which is unavailable on this system. Cases run without them.")
+        isolate = False
 
-        # Here, we check if there are errors
-        if "errors" in c.keys():
+    # === Skip cached cases ===
+    # Only passing results are cached, so failing cases always show their current error
+    cache_path = RESULTS_CACHE if cache else None
+    cached = {}
+    keys = {}
+
+    if cache_path:
+        stored = load_results(cache_path)
+        solution = solution_hash(runner)
+
+        for cx, c in selected:
+            keys[cx] = result_key(solution, c, isolate)
+
+            if keys[cx] in stored:
+                cached[cx] = dict(stored[keys[cx]], error=None, verdict="AC", cached=True)
+
+    to_run = [c for cx, c in selected if cx not in cached]
+
+    # === Run each case ===
+    # Results are yielded in case order, whether run serially or in parallel
+    ex = None
+    rows = []
 
-            # If there are errors, print the error out
-            print(c["errors"])
+    if runner:
+        # Each case runs in its own process already, so threads are enough to run them in parallel
+        if parallel:
+            ex = ThreadPoolExecutor(max_workers=os.cpu_count())
+            results = ex.map(lambda c: run_case(c, runner=runner), to_run)
 
         else:
+            results = (run_case(c, runner=runner) for c in to_run)
 
-            # If there are no exceptions, we check that the answer is correct
-            try: 
+    elif isolate:
+        results = run_limited(to_run, os.cpu_count() if parallel else 1)
+
+    elif parallel:
+        ex = ProcessPoolExecutor(max_workers=os.cpu_count())
+        results = ex.map(run_worker, to_run)
+
+    else:
+        results = (run_case(c) for c in to_run)
+
+    try: 
+        for cx, c in selected:
+
+            # Print out test case
+            print(f"({f}) test case {cx} '{c['filename']}': ", end="")
+
+            result = cached[cx] if cx in cached else next(results)
+            rows.append((c, result))
+
+            # Here, we check if there are errors
+            if result["error"] is not None:
+                c["errors"] = result["error"]
 
-                assert "\n".join(fnc.fptr.get_answers()).strip() == c["outputs"].strip()
+                # If there are errors, print the verdict and error out
+                print(f"{result['verdict']}: {str(c['errors']) or repr(c['errors'])}")
+
+            elif result.get("cached"):
+                print("Success (cached)")
+
+            else:
+                print(f"Success ({result['wall'] * 1000:.1f} ms)")
+
+    finally:
+        if ex: 
+            ex.shutdown(cancel_futures=True)
+
+        # Cache the passing results, even of an interrupted run
+        # Results served from the cache are moved to the most recent end too, so that save_results() evicts the least recently used
+        if cache_path:
+            for (cx, _), (c, result) in zip(selected, rows):
+                if cx in cached:
+                    stored[keys[cx]] = stored.pop(keys[cx])
+
+                elif result["error"] is None:
+                    stored.pop(keys[cx], None)
+                    stored[keys[cx]] = {m: result[m] for m in ["wall", "cpu", "memory"]}
+
+            try: 
+                save_results(stored, cache_path)
 
-                print("Success")
+            except OSError:
+                warnings.warn(f"The results cache '{cache_path}' could not be saved.")
 
-            except Exception as e:
-                
-                # There are, as of now, no errors
-                # We set the errors to the assertion error
-                c["errors"] = e
-                
-                # Print the error
-                print(e)
+    # === Report performance ===
+    report(f, rows, runner_key(runner))
 
     # Finally, we raise all errors so py.test recognises that this test case failed
     for c in cases:
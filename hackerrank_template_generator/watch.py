@@ -0,0 +1,224 @@
+# === Watch mode ===
+"""
+Re-runs the cases of the workspace whenever functions.py or a case file is saved, keeping the interpreter and the cases loaded between runs.
+
+Run it from the workspace with
+    python watch.py
+and stop it with Ctrl+C. Cases that failed in the previous run are run first.
+"""
+from pathlib import Path
+import os
+import sys
+import time
+import importlib
+import importlib.util
+from datetime import datetime
+
+from argparse import ArgumentParser
+
+import test_functions as tf
+
+
+def snapshot(paths):
+    """
+    Returns the modification time and size of each file at paths, and of each file in the folders among them, to tell when any is saved.
+    """
+    state = {}
+
+    for path in paths:
+        path = Path(path)
+
+        if path.is_dir():
+            for entry in os.scandir(path):
+
+                # Skip the case index and other hidden files
+                if not entry.name.startswith("."):
+                    stat = entry.stat()
+                    state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+        elif path.exists():
+            stat = path.stat()
+            state[str(path)] = (stat.st_mtime_ns, stat.st_size)
+
+    return state
+
+
+def reload_functions():
+    """
+    Reloads functions.py, which recreates its fptr and stdin.
+
+    Returns
+    =======
+    loaded: bool
+        Whether functions.py loaded without errors.
+    """
+    # Saves within the same second may keep the size of the file, which would pass for the stale bytecode
+    Path(importlib.util.cache_from_source(tf.fnc.__file__)).unlink(missing_ok=True)
+
+    try:
+        importlib.reload(tf.fnc)
+
+    except Exception as e:
+        print(f"functions.py failed to load: {e!r}")
+
+        return False
+
+    return True
+
+
+def load_cases(folders, loaded, select=None, tags=[]):
+    """
+    Collects the selected cases of the folders, reusing the loaded cases whose files are unchanged, so that only new or edited case files are read.
+
+    Params
+    ======
+    folders: []
+        Array of the names of the case folders.
+    loaded: {}
+        Dictionary of the (folder, case name, case file hash) of each loaded case to its Case. It is updated in place to only hold the returned cases.
+    select, tags:
+        As in test_functions.run_test().
+
+    Returns
+    =======
+    cases: []
+        Array of (folder, case) tuples, in order.
+    """
+    cases = []
+    fresh = {}
+
+    for f in folders:
+        if not Path(f).is_dir():
+            continue
+
+        for _, c in tf.select_cases(f, tf.get_cases(f), select=select, tags=tags):
+            key = (f, c["filename"], c["hash"])
+
+            if key in loaded:
+                c = loaded[key]
+
+            else:
+                # Read the case now rather than while it runs
+                c["inputs"]
+
+            fresh[key] = c
+            cases.append((f, c))
+
+    loaded.clear()
+    loaded.update(fresh)
+
+    return cases
+
+
+def run(cases, failed, workers=1):
+    """
+    Runs the cases, those that failed in the previous run first, printing the failures and a summary.
+
+    Params
+    ======
+    cases: []
+        Array of (folder, case) tuples, as returned by load_cases().
+    failed: set
+        Set of the (folder, case name) of the cases that failed in the previous run.
+    workers: int
+        The number of cases run at a time under hard limits, if available.
+
+    Returns
+    =======
+    failed: set
+        Set of the (folder, case name) of the cases that failed in this run.
+    """
+    # Stable, so cases keep their order otherwise
+    cases = sorted(cases, key=lambda x: (x[0], x[1]["filename"]) not in failed)
+
+    start_time = time.perf_counter()
+
+    if tf.ISOLATE and tf.resource is not None:
+        results = tf.run_limited([c for _, c in cases], workers)
+
+    else:
+        results = (tf.run_case(c) for _, c in cases)
+
+    failed = set()
+
+    for (f, c), result in zip(cases, results):
+        if result["error"] is not None:
+            failed.add((f, c["filename"]))
+
+            print(f"({f}) {c['filename']}: {result['verdict']}: {str(result['error']) or repr(result['error'])}")
+
+    elapsed = time.perf_counter() - start_time
+
+    print(f"[{datetime.now():%H:%M:%S}] {len(cases) - len(failed)}/{len(cases)} passed in {elapsed * 1000:.0f} ms")
+
+    return failed
+
+
+def watch(folders, interval=0.2, select=None, tags=[], workers=1):
+    """
+    Runs the cases of the folders, then re-runs them on every save of functions.py or of a case file, until interrupted.
+
+    Params
+    ======
+    folders: []
+        Array of the names of the case folders.
+    interval: float
+        The number of seconds between checks for saves.
+    select, tags:
+        As in test_functions.run_test().
+    workers: int
+        The number of cases run at a time under hard limits, if available.
+    """
+    paths = [tf.fnc.__file__] + folders
+
+    state = None
+    loaded = {}
+    failed = set()
+
+    while True:
+        current = snapshot(paths)
+
+        if current == state:
+            time.sleep(interval)
+            continue
+
+        # Wait for editors that save in several writes to finish
+        while current != state:
+            state = current
+            time.sleep(interval)
+            current = snapshot(paths)
+
+        if not reload_functions():
+            continue
+
+        try:
+            cases = load_cases(folders, loaded, select, tags)
+
+        except Exception as e:
+            print(f"The cases failed to load: {e}")
+            continue
+
+        failed = run(cases, failed, workers)
+
+
+# === Script ===
+if __name__ == "__main__":
+    ap = ArgumentParser(description="Re-runs the cases whenever functions.py or a case file is saved.")
+    ap.add_argument("folders", nargs="*", default=["test_cases", "verification_cases"], help="Case folders.")
+    ap.add_argument("--interval", type=float, default=0.2, help="Seconds between checks for saves.")
+    ap.add_argument("--select", default=tf.SELECT, help="Glob that the names of the cases to run must match.")
+    ap.add_argument("--tag", dest="tags", action="append", default=list(tf.TAGS), help="Tag that the cases to run must have. May be repeated.")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() if tf.PARALLEL else 1, help="Cases run at a time under hard limits.")
+
+    args = ap.parse_args()
+
+    # Bytecode of intermediate saves is never reused
+    sys.dont_write_bytecode = True
+
+    print(f"Watching functions.py and {', '.join(args.folders)}. Press Ctrl+C to stop.")
+
+    try:
+        watch(args.folders, args.interval, args.select, args.tags, args.workers)
+
+    except KeyboardInterrupt:
+        print("Stopped.")
@@ -1,12 +1,92 @@
 # === FolderWriter Class ===
 from pathlib import Path
+from functools import lru_cache
+import io
+import os
 import re
+import codecs
+import fnmatch
+import gzip
+import lzma
+import shutil
+import tempfile
+
+# Files copied into every workspace to test and benchmark the solution
+# configs.json gives the harness the language of the workspace and its limits
+HARNESS_FILES = ["test_functions.py", "conftest.py", "benchmark.py", "stress.py", "watch.py", "runners.py", "configs.json"]
+
+# Patterns of the names of the files FolderWriter generates, by folder of the workspace, which are not carried over from the workspace it replaces
+# Case folders also hold the manifests of test_functions.py and store.py, which describe the generated cases
+GENERATED = {
+    ".": ["README.md", "functions.py", *HARNESS_FILES],
+    "test_cases": ["sample_case_*", ".index.json", ".objects.json"],
+    "verification_cases": [".index.json"]
+}
+
+# Suffix and text-mode opener of compressed case files, by compression, as read by test_functions.get_cases()
+# Higher lzma presets compress numbers barely better, but many times slower
+COMPRESSIONS = {
+    "gzip": (".gz", lambda path: gzip_writer(path, compresslevel=6)),
+    "lzma": (".xz", lambda path: lzma.open(path, "wt", encoding="utf-8", preset=1))
+}
+
+
+def gzip_writer(path, compresslevel=6):
+    """
+    Opens a gzip file for writing text. Its header holds neither a file name nor a modification time, so that identical cases compress to identical bytes and are kept once in the case store.
+    """
+    raw = open(path, "wb")
+
+    try:
+        gz = gzip.GzipFile(filename="", mode="wb", compresslevel=compresslevel, fileobj=raw, mtime=0)
+
+    except BaseException:
+        raw.close()
+
+        raise
+
+    # GzipFile closes only the files it opened itself, as gzip.open() does
+    gz.myfileobj = raw
+
+    return io.TextIOWrapper(gz, encoding="utf-8")
+
+
+# Folder of the templates, i.e. the harness files and functions_base.py
+TEMPLATES = Path(__file__).resolve().parent
+
+
+@lru_cache(maxsize=None)
+def template(name):
+    """
+    Returns the contents of the template of the given name, read once per run.
+    """
+    with (TEMPLATES / name).open("r") as fr:
+        return fr.read()
+
+
+@lru_cache(maxsize=None)
+def function_base():
+    """
+    Returns the main() header and the workspace content of functions_base.py, as arrays of lines.
+    """
+    contents = template("functions_base.py").split("\n")
+
+    return contents[8:20], contents[21:]
+
 
 class FolderWriter():
     """
     Handle writing to the new folder.
     """
-    def __init__(self, dest, title, link, imports, function, main, inputs, outputs):
+    def __init__(self, dest, title, link, imports, function, main, inputs, outputs, store=None, compression=None):
+        """
+        Params
+        ======
+        store: store.ObjectStore
+            The shared store to keep the test cases in, or None to keep them in the workspace only.
+        compression: str
+            The compression of the test case files, "gzip" or "lzma", or None to write them as plain text.
+        """
         self.dest = dest 
         self.title = title
         self.link = link
@@ -15,52 +95,102 @@ class FolderWriter():
         self.main = main
         self.inputs = inputs
         self.outputs = outputs
+        self.store = store
+        self.compression = compression
 
 
     def write(self):
         """
         Writes to files in the new desired folder.
+
+        The workspace is built in a temporary folder next to it, then renamed into place, so an interrupted run never leaves it half-written. If the workspace exists, its files that are not generated, e.g. verification cases, are carried over.
         """
         # Identify parent folder
         parent = Path(self.dest)
         parent = parent.resolve(strict=True)
 
-        # Create folder
         target_folder = parent / self.title.lower().replace(" ", "_")
-        target_folder = target_folder
-        target_folder.exists() or target_folder.mkdir()
 
-        # Create README
-        README_path = target_folder / "README.md"
-        README_path.exists() or README_path.touch()
-        
-        rw = READMEWriter(README_path, self.title, self.link)
-        rw.write()
+        # Build the workspace in a temporary folder on the same file system
+        tmp = Path(tempfile.mkdtemp(dir=parent, prefix=f".{target_folder.name}."))
+
+        try:
+            # mkdtemp() makes the folder private, so give it the permissions of the folder it replaces
+            os.chmod(tmp, (target_folder if target_folder.exists() else parent).stat().st_mode & 0o777)
 
-        # Create test_functions.py
-        tf_path = target_folder / "test_functions.py"
-        tf_path.exists() or tf_path.touch()
+            # Write README.md, functions.py and the harness files
+            READMEWriter(tmp / "README.md", self.title, self.link).write()
+            FunctionWriter(tmp / "functions.py", self.imports, self.function, self.main).write()
 
-        tfw = TestFunctionWriter(tf_path)
-        tfw.write()
+            for harness in HARNESS_FILES:
+                TestFunctionWriter(tmp / harness, harness).write()
 
-        # Create functions.py
-        f_path = target_folder / "functions.py"
-        f_path.exists() or f_path.touch()
+            # Create test case folder and write test cases
+            tc_path = tmp / "test_cases"
+            tc_path.mkdir()
 
-        fw = FunctionWriter(f_path, self.imports, self.function, self.main)
-        fw.write()
+            tcw = TestCaseWriter(tc_path, self.inputs, self.outputs, self.compression)
+            tcw.write()
 
-        # Create test case folder and write test cases
-        tc_path = target_folder / "test_cases"
-        tc_path.exists() or tc_path.mkdir()
+            # Replace the test cases by links to the shared store
+            if self.store:
+                self.store.add_folder(tc_path, target_folder / "test_cases")
 
-        tcw = TestCaseWriter(tc_path, self.inputs, self.outputs)
-        tcw.write()
+            # Create verification case folder, to be left empty
+            (tmp / "verification_cases").mkdir()
 
-        # Create verification case folder, to be left empty
-        vc_path = target_folder / "verification_cases"
-        vc_path.exists() or vc_path.mkdir()
+            if target_folder.exists():
+                carry_over(target_folder, tmp)
+
+                # Swap the old workspace out, then the new one in
+                old = Path(tempfile.mkdtemp(dir=parent, prefix=f".{target_folder.name}.old."))
+                os.replace(target_folder, old / target_folder.name)
+
+                try:
+                    os.replace(tmp, target_folder)
+
+                except BaseException:
+                    os.replace(old / target_folder.name, target_folder)
+
+                    raise
+
+                shutil.rmtree(old, ignore_errors=True)
+
+            else:
+                os.replace(tmp, target_folder)
+
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+            raise
+
+
+def carry_over(src, dst, generated=None):
+    """
+    Copies the files and folders in src that are missing from dst into dst, recursively, except those FolderWriter generates, see GENERATED.
+
+    Params
+    ======
+    generated: []
+        The patterns of the names generated in src, by default those of the workspace itself.
+    """
+    generated = GENERATED["."] if generated is None else generated
+
+    for path in src.iterdir():
+        target = dst / path.name
+
+        if any(fnmatch.fnmatchcase(path.name, g) for g in generated):
+            continue
+
+        if path.is_dir() and not path.is_symlink():
+            if target.is_dir():
+                carry_over(path, target, GENERATED.get(path.name, []))
+
+            elif not target.exists():
+                shutil.copytree(path, target, symlinks=True)
+
+        elif not target.exists():
+            shutil.copy2(path, target, follow_symlinks=False)
 
 
 # === READMEWriter Class ===
@@ -74,43 +204,47 @@ class READMEWriter():
         self.link = link
         self.version = version
 
-    
-    def write(self):
+
+    def render(self):
         """
-        Writes to the README file in the given directory.
+        Returns the contents of the README file.
         """
-        # Open path
-        with self.path.open("w") as fw:
+        return "".join([
             # Title
-            fw.write(f"# {self.title}")
+            f"# {self.title}",
 
             # Auto-generation statement
-            fw.write(f"\n*This README.md is instantiated by HackerRank Coding Template Version {self.version}")
+            f"\n*This README.md is instantiated by HackerRank Coding Template Version {self.version}",
 
             # Link to problem
-            fw.write(f"\n\nThis problem can be found [here]({self.link}).")        
+            f"\n\nThis problem can be found [here]({self.link})."
+        ])
+
+    
+    def write(self):
+        """
+        Writes to the README file in the given directory.
+        """
+        with self.path.open("w") as fw:
+            fw.write(self.render())
 
 
 # === TestFunctionWriter Class ===
 class TestFunctionWriter():
     """
-    Copies contents of test_functions.py and pastes them in the given destination.
+    Copies contents of test_functions.py, or another harness script, and pastes them in the given destination.
     """
-    def __init__(self, path):
+    def __init__(self, path, source="test_functions.py"):
         self.path = path
+        self.source = source
 
 
     def write(self):
         """
         Copies and writes.
         """
-        contents = None 
-
-        with open("test_functions.py", "r") as fr: 
-            contents = fr.read() 
-
         with self.path.open("w") as fw:
-            fw.write(contents)
+            fw.write(template(self.source))
 
 
 # === FunctionWriter Class ===
@@ -124,59 +258,45 @@ class FunctionWriter():
         self.function = function
         self.main = main
 
-    
-    def write(self):
+
+    def render(self):
         """
-        Handles the function writing. This is intricately mixed with 'functions_base.py' and should be changed if there is a change in the aforementioned file.
+        Returns the contents of functions.py. This is intricately mixed with 'functions_base.py' and should be changed if there is a change in the aforementioned file.
         """
-        base_main = None
-        base_workspace = None
-
-        with open("functions_base.py", "r") as fr:
-            contents = fr.read().split("\n")
+        base_main, base_workspace = function_base()
 
-            base_main = contents[8:20]
-            base_workspace = contents[21:]
-
-        with self.path.open("w") as fw:
-            # Write imports
-            fw.write("# === Imports ===")
-            
-            for i in self.imports: 
-                fw.write(f"\n{i}")
+        # Imports
+        parts = ["# === Imports ==="]
+        parts += [f"\n{i}" for i in self.imports]
 
-            # Write function
-            fw.write("\n")
-            fw.write("\n# === Function ===")
-            fw.write(f"\n{self.function}")
-            fw.write(f"\n    pass")
+        # Function
+        parts += ["\n", "\n# === Function ===", f"\n{self.function}", "\n    pass"]
 
-            # Write main() function header
-            fw.write("\n\n")
+        # main() function header
+        parts += ["\n\n"]
+        parts += [f"\n{line}" for line in base_main]
 
-            for line in base_main: 
-                fw.write("\n")
-                fw.write(line)
+        # Main function contents
+        # Conditional check to ensure the remainder can be 'copy-pasted' in
+        # assert re.match("if __name__ == [\"']__main__[\"']", self.main[0])
+        # assert re.search("open\(.*\)", self.main[1])
 
-            # Write main function contents
-            # Conditional check to ensure the remainder can be 'copy-pasted' in
-            # assert re.match("if __name__ == [\"']__main__[\"']", self.main[0])
-            # assert re.search("open\(.*\)", self.main[1])
+        # If there is an open() function, do not write
+        parts += [f"\n{line}" for line in self.main[1:] if not re.search("open(.*)", line)]
 
-            for line in self.main[1:]:
-                # If there is an open() function, do not write
-                if re.search("open(.*)", line):
-                    continue
+        # Finish up with base workspace content
+        parts += ["\n\n"]
+        parts += [f"\n{line}" for line in base_workspace]
 
-                fw.write("\n")
-                fw.write(line)
+        return "".join(parts)
 
-            # Finish up with base workspace content
-            fw.write("\n\n")
-
-            for line in base_workspace:
-                fw.write("\n")
-                fw.write(line)
+    
+    def write(self):
+        """
+        Handles the function writing.
+        """
+        with self.path.open("w") as fw:
+            fw.write(self.render())
 
 
 # === TestCaseWriter Class ===
@@ -184,13 +304,17 @@ class TestCaseWriter():
     """
     A class to write the test cases.
     """
-    def __init__(self, path, inputs, outputs):
+    def __init__(self, path, inputs, outputs, compression=None):
         # Check they are of equal length so they can be paired together
         assert len(inputs) == len(outputs) 
 
+        # Only compressions that get_cases() reads are written
+        assert compression is None or compression in COMPRESSIONS, f"Unknown compression '{compression}'."
+
         self.path = path
         self.inputs = inputs
         self.outputs = outputs
+        self.compression = compression
 
 
     def write(self):
@@ -202,7 +326,76 @@ class TestCaseWriter():
             
             new_path = self.path / f"sample_case_{x}.txt"
 
-            with new_path.open("w") as fw:
-                fw.write(i)
+            if self.compression:
+                suffix, opener = COMPRESSIONS[self.compression]
+                fw = opener(new_path.with_name(new_path.name + suffix))
+
+            else:
+                fw = new_path.open("w")
+
+            with fw:
+                write_part(fw, i)
                 fw.write("\n---\n")
-                fw.write(j)
\ No newline at end of file
+                write_part(fw, j)
+
+
+def write_part(fw, part):
+    """
+    Writes an input or output to fw. 
+
+    Params
+    ======
+    fw: file
+        The case file, opened for writing in text mode.
+    part: str or challenge.Member
+        The input or output. A Member is streamed from its zip file and stripped of surrounding whitespace on the way, so it is never held in memory as a whole.
+    """
+    if isinstance(part, str):
+        fw.write(part)
+
+    else:
+        with part.open() as fr:
+            copy_stripped(fr, fw)
+
+
+def copy_stripped(fr, fw, chunk_size=1024 * 1024):
+    """
+    Copies the UTF-8 bytes of fr into fw in chunks, stripping the leading and trailing whitespace of the whole.
+
+    Params
+    ======
+    fr: file
+        The source, opened for reading in binary mode.
+    fw: file
+        The destination, opened for writing in text mode.
+    chunk_size: int
+        The number of bytes read at a time.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    started = False
+
+    # Whitespace held back until it is known not to be trailing
+    pending = ""
+
+    while True:
+        chunk = fr.read(chunk_size)
+        text = decoder.decode(chunk, final=not chunk)
+
+        if not started:
+            text = text.lstrip()
+            started = bool(text)
+
+        body = text.rstrip()
+
+        if body:
+            fw.write(pending)
+            fw.write(body)
+
+            pending = text[len(body):]
+
+        else:
+            pending += text
+
+        if not chunk:
+            break